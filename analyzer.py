@@ -0,0 +1,115 @@
+from fields import classify_fields, FIELDS_BY_NAME
+from instrumentation import timer
+from recommender import recommend_courses
+from resume_parser import content_hash, extract_from_document, ingest_pdf
+from sections import detect_sections, score_sections
+
+# Bump whenever the skill vocabulary, field table or scoring rules change.
+# Stored results from an older version are re-derived from their saved text
+# (see reanalyze.py) instead of being served as they are.
+ANALYZER_VERSION = '7'
+
+# Courses listed with an analysis (the UI lets the user ask for more)
+DEFAULT_COURSES = 4
+
+
+def candidate_level(no_of_pages):
+    """Guess the experience level from the resume length"""
+    if no_of_pages == 1:
+        return "Fresher"
+    if no_of_pages == 2:
+        return "Intermediate"
+    if no_of_pages >= 3:
+        return "Experienced"
+    return ""
+
+
+def analyze_document(doc):
+    """Run the full analysis on an ingested document with no UI calls"""
+    resume_data = extract_from_document(doc)
+    resume_text = doc['text']
+
+    with timer('classify'):
+        ranking = classify_fields(resume_data['skill_hits'])
+    field = FIELDS_BY_NAME[ranking[0][0]] if ranking else None
+    courses = recommend_courses(field['name'], resume_data['skills'], DEFAULT_COURSES,
+                                seed=doc['hash']) if field else []
+    with timer('sections'):
+        section_spans = detect_sections(resume_text)
+        resume_score, sections = score_sections(resume_text, section_spans)
+
+    return {
+        'fingerprint': doc['hash'],
+        'analyzer_version': ANALYZER_VERSION,
+        'name': resume_data['name'],
+        'email': resume_data['email'],
+        'mobile_number': resume_data['mobile_number'],
+        'linkedin': resume_data['linkedin'],
+        'github': resume_data['github'],
+        'no_of_pages': resume_data['no_of_pages'],
+        'skills': resume_data['skills'],
+        'user_level': candidate_level(resume_data['no_of_pages']),
+        'predicted_field': field['name'] if field else '',
+        'field_ranking': [{'field': name, 'score': score, 'confidence': confidence}
+                          for name, score, confidence in ranking],
+        'recommended_skills': field['recommended_skills'] if field else [],
+        'recommended_courses': [{'name': name, 'link': link} for name, link in courses],
+        'resume_score': resume_score,
+        'sections': {section['key']: found for section, found in sections},
+        'section_spans': section_spans,
+    }
+
+
+def analyze_resume(pdf):
+    """Run the full analysis on a PDF path/bytes/upload with no UI calls"""
+    return analyze_document(ingest_pdf(pdf))
+
+
+def parse_and_analyze(pdf_bytes):
+    """(analysis, document) for raw PDF bytes"""
+    doc = ingest_pdf(pdf_bytes)
+    return analyze_document(doc), doc
+
+
+def _run_inline(func, *args):
+    return func(*args)
+
+
+def get_analysis(pdf_bytes, database=None, run=_run_inline):
+    """Return (analysis, document) for an upload, reusing stored work.
+
+    A resume already analyzed under ANALYZER_VERSION comes straight from the
+    database and ``document`` is None (nothing new to save). If only the
+    analyzer changed, the stored text is re-analyzed without parsing the PDF.
+    The heavy work goes through ``run(func, *args)``, e.g. limits.run_limited.
+    """
+    fingerprint = content_hash(pdf_bytes)
+    if database:
+        stored = database.find_analysis(fingerprint)
+        if stored and stored.get('analyzer_version') == ANALYZER_VERSION:
+            return stored, None
+        if stored:
+            doc = database.load_document(fingerprint)
+            if doc:
+                return run(analyze_document, doc), doc
+    return run(parse_and_analyze, pdf_bytes)
+
+
+def result_row(analysis, courses=(), created_at=None, document=None):
+    """Shape an analysis for Database.insert_results()"""
+    return {
+        'name': analysis['name'],
+        'email': analysis['email'],
+        'resume_score': analysis['resume_score'],
+        'no_of_pages': analysis['no_of_pages'],
+        'created_at': created_at,
+        'predicted_field': analysis['predicted_field'],
+        'user_level': analysis['user_level'],
+        'skills': analysis['skills'],
+        'recommended_skills': analysis['recommended_skills'],
+        'courses': list(courses),
+        'fingerprint': analysis['fingerprint'],
+        'analyzer_version': analysis['analyzer_version'],
+        'analysis': analysis,
+        'document': document,
+    }
@@ -0,0 +1,210 @@
+"""HTTP API for resume analysis, separate from the Streamlit UI.
+
+    python api.py [--host 127.0.0.1] [--port 8080] [--workers 4]
+
+    curl --data-binary @resume.pdf -H 'Content-Type: application/pdf' \\
+        http://127.0.0.1:8080/analyze
+
+POST /analyze takes the raw PDF as the request body and returns the analysis
+as JSON (the same dict analyzer.analyze_resume() returns to the UI).
+GET /health reports how busy the worker pool is.
+
+Parsing is CPU bound, so each analysis runs in a process of its own
+(limits.run_in_process). At most ``workers`` analyses run at once and at
+most ``max_pending`` more wait for a worker; beyond that requests get 503
+straight away instead of queueing without bound. An analysis still running
+after the timeout is killed (504), one whose process dies gets 500, and
+bodies over SRA_API_MAX_BODY_BYTES get 413.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from analyzer import analyze_resume
+from limits import AnalysisTimeout, run_in_process
+
+HOST = os.environ.get('SRA_API_HOST', '127.0.0.1')
+PORT = int(os.environ.get('SRA_API_PORT', 8080))
+WORKERS = int(os.environ.get('SRA_API_WORKERS', os.cpu_count() or 1))
+MAX_PENDING = int(os.environ.get('SRA_API_MAX_PENDING', 2 * WORKERS))
+MAX_BODY_BYTES = int(os.environ.get('SRA_API_MAX_BODY_BYTES', 10 * 1024 * 1024))
+ANALYSIS_TIMEOUT = float(os.environ.get('SRA_API_TIMEOUT', 30))
+# Slow clients can't hold a connection open forever while sending headers/body
+READ_TIMEOUT = 10.0
+MAX_HEADER_BYTES = 16 * 1024
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           408: 'Request Timeout', 411: 'Length Required', 413: 'Payload Too Large',
+           415: 'Unsupported Media Type', 422: 'Unprocessable Entity', 500: 'Internal Server Error',
+           503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class AnalysisService:
+    """Bounded analysis processes with admission control"""
+
+    def __init__(self, workers=WORKERS, max_pending=MAX_PENDING, timeout=ANALYSIS_TIMEOUT):
+        self.workers = workers
+        self.capacity = workers + max_pending
+        self.timeout = timeout
+        self.in_flight = 0
+        self.served = 0
+        # Each thread waits on one analysis process
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    async def analyze(self, data):
+        if self.in_flight >= self.capacity:
+            raise HTTPError(503, "Analyzer is busy, try again shortly", {'Retry-After': '1'})
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor,
+                                      partial(run_in_process, analyze_resume, data, timeout=self.timeout,
+                                              concurrent=self.workers))
+        self.in_flight += 1
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.shield(future)
+        except AnalysisTimeout:
+            raise HTTPError(504, f"Analysis took longer than {self.timeout:g}s")
+
+    def _release(self, future):
+        self.in_flight -= 1
+        self.served += 1
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Error analyzing resume: {future.exception()}")
+
+    def status(self):
+        return {'status': 'ok', 'workers': self.workers, 'in_flight': self.in_flight,
+                'capacity': self.capacity, 'served': self.served}
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def read_request(reader, max_body=MAX_BODY_BYTES):
+    """Return (method, path, headers, body) for one HTTP/1.1 request"""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), READ_TIMEOUT)
+    except asyncio.LimitOverrunError:
+        raise HTTPError(400, "Request headers too large")
+    except asyncio.TimeoutError:
+        raise HTTPError(408, "Timed out reading request")
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, _ = lines[0].split(' ', 2)
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    body = b''
+    if method == 'POST':
+        if 'content-length' not in headers:
+            raise HTTPError(411, "Content-Length is required")
+        try:
+            length = int(headers['content-length'])
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > max_body:
+            raise HTTPError(413, f"Body exceeds {max_body} bytes")
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length), READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPError(408, "Timed out reading request body")
+    return method, target.split('?', 1)[0], headers, body
+
+
+def render_response(status, payload, headers=None):
+    body = json.dumps(payload, default=str).encode('utf-8')
+    lines = [f'HTTP/1.1 {status} {REASONS.get(status, "")}',
+             'Content-Type: application/json',
+             f'Content-Length: {len(body)}',
+             'Connection: close']
+    lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+async def route(service, method, path, body):
+    if path == '/health':
+        if method != 'GET':
+            raise HTTPError(405, "Use GET", {'Allow': 'GET'})
+        return service.status()
+    if path == '/analyze':
+        if method != 'POST':
+            raise HTTPError(405, "Use POST with the PDF as the body", {'Allow': 'POST'})
+        if not body.startswith(b'%PDF'):
+            raise HTTPError(415, "Body is not a PDF")
+        try:
+            analysis = await service.analyze(body)
+        except HTTPError:
+            raise
+        except Exception as e:
+            raise HTTPError(500, f"Analysis failed: {type(e).__name__}")
+        if not analysis['no_of_pages']:
+            raise HTTPError(422, "Could not read any pages from the PDF")
+        return analysis
+    raise HTTPError(404, f"No route for {path}")
+
+
+def make_handler(service, max_body=MAX_BODY_BYTES):
+    async def handle(reader, writer):
+        try:
+            try:
+                method, path, _, body = await read_request(reader, max_body)
+                status, payload, headers = 200, await route(service, method, path, body), None
+            except HTTPError as e:
+                status, payload, headers = e.status, {'error': str(e)}, e.headers
+            except asyncio.IncompleteReadError:
+                return
+            writer.write(render_response(status, payload, headers))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(host=HOST, port=PORT, service=None, max_body=MAX_BODY_BYTES):
+    service = service or AnalysisService()
+    server = await asyncio.start_server(make_handler(service, max_body), host, port, limit=MAX_HEADER_BYTES)
+    print(f"Resume analyzer API listening on http://{host}:{port} "
+          f"({service.workers} workers, {service.capacity} max in flight)", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve resume analysis over HTTP")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--max-pending', type=int, default=MAX_PENDING)
+    parser.add_argument('--timeout', type=float, default=ANALYSIS_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    service = AnalysisService(args.workers, args.max_pending, args.timeout)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
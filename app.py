@@ -1,125 +1,44 @@
 import streamlit as st
-import nltk
-
-# Import for basic NLP
-nltk.download('stopwords')
-nltk.download('punkt')
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-
-import pandas as pd
-import base64, random
-import time, datetime
-import pdfplumber
-import re
+
+import random
+import datetime
 import io
-from streamlit_tags import st_tags
-from PIL import Image
-import pymysql
+import csv
+import tempfile
+from functools import partial
 # Import your course lists
-from courses import ds_course, web_course, android_course, ios_course, uiux_course, resume_videos, interview_videos
-import plotly.express as px
+from courses import resume_videos, interview_videos
+from fields import FIELDS_BY_NAME
+from sections import SECTIONS
+from analyzer import get_analysis, result_row
+from recommender import recommend_courses
+from db import get_database
+from instrumentation import timer
+from limits import PREVIEW_TIMEOUT, AnalysisFailed, LimitExceeded, check_upload, run_limited
+from storage import save_upload, render_thumbnail
 
 
 # Remove pafy and youtube_dl imports since they're having issues
 
-def pdf_reader(file):
-    text = ""
-    try:
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-    except Exception as e:
-        print(f"Error reading PDF file: {e}")
-    return text
+def show_pdf(pdf_bytes, resume_hash):
+    # A small first-page thumbnail instead of the whole PDF inlined as base64,
+    # rendered within the limits since the PDF is untrusted
+    with timer('preview'):
+        thumbnail = render_thumbnail(pdf_bytes, resume_hash,
+                                     run=partial(run_limited, timeout=PREVIEW_TIMEOUT))
+    if thumbnail:
+        st.image(thumbnail, caption="First page preview", width=350)
 
 
-def extract_resume_data(pdf_path):
-    """Extract basic information from resume PDF"""
-    try:
-        import nltk
-        nltk.download('punkt')
-    except:
-        pass
-    # Extract text
-    text = pdf_reader(pdf_path)
-
-    # Count pages
-    with pdfplumber.open(pdf_path) as pdf:
-        no_of_pages = len(pdf.pages)
-
-    # Extract email
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    email = emails[0] if emails else ""
-
-    # Extract phone number
-    phone_pattern = r'(\+\d{1,3}[-.\s]??)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-    phones = re.findall(phone_pattern, text)
-    phone = phones[0] if phones else ""
-
-    # Extract name (Basic approach - assuming name is in the first few lines)
-    lines = text.split('\n')
-    name = ""
-    for line in lines[:5]:  # Check first 5 lines
-        if line and not any(
-                keyword in line.lower() for keyword in ['resume', 'cv', 'curriculum', 'email', 'phone', 'address']):
-            # Assume first significant line that's not a header might be the name
-            name = line.strip()
-            break
-
-    # Extract skills - define skill keywords
-    skill_keywords = [
-        'python', 'java', 'javascript', 'html', 'css', 'react', 'angular', 'node',
-        'sql', 'mongodb', 'django', 'flask', 'machine learning', 'ai', 'data science',
-        'excel', 'powerpoint', 'word', 'adobe', 'photoshop', 'c++', 'c#', 'php',
-        'kubernetes', 'docker', 'aws', 'azure', 'gcp', 'linux', 'bash', 'git',
-        'agile', 'scrum', 'project management', 'leadership'
-    ]
-
-    # Tokenize the text and find skills
-    tokens = word_tokenize(text.lower())
-    skills = []
-
-    # Check for single word skills
-    for skill in skill_keywords:
-        if skill in tokens or skill in text.lower():
-            skills.append(skill)
-
-    # Check for multi-word skills
-    for skill in skill_keywords:
-        if ' ' in skill and skill in text.lower():
-            skills.append(skill)
-
-    return {
-        'name': name,
-        'email': email,
-        'mobile_number': phone,
-        'skills': skills,
-        'no_of_pages': no_of_pages
-    }
-
-
-def show_pdf(file_path):
-    with open(file_path, "rb") as f:
-        base64_pdf = base64.b64encode(f.read()).decode('utf-8')
-    pdf_display = F'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
-    st.markdown(pdf_display, unsafe_allow_html=True)
-
-
-def course_recommender(course_list):
+def course_recommender(analysis):
     st.subheader("**Courses & Certificates🎓 Recommendations**")
-    c = 0
-    rec_course = []
     no_of_reco = st.slider('Choose Number of Course Recommendations:', 1, 10, 4)
-    random.shuffle(course_list)
-    for c_name, c_link in course_list:
-        c += 1
+    # Seeded with the resume fingerprint, so reruns keep the same list
+    courses = recommend_courses(analysis['predicted_field'], analysis['skills'], no_of_reco,
+                                seed=analysis['fingerprint'])
+    for c, (c_name, c_link) in enumerate(courses, 1):
         st.markdown(f"({c}) [{c_name}]({c_link})")
-        rec_course.append(c_name)
-        if c == no_of_reco:
-            break
-    return rec_course
+    return [c_name for c_name, _ in courses]
 
 
 def fetch_yt_title(link):
@@ -128,35 +47,203 @@ def fetch_yt_title(link):
     return f"YouTube Video (ID: {video_id})"
 
 
-def get_table_download_link(df, filename, text):
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()  # some strings <-> bytes conversions necessary here
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">{text}</a>'
-    return href
+RESULT_HEADERS = ['ID', 'Name', 'Email', 'Resume Score', 'Timestamp', 'Total Page', 'Predicted Field',
+                  'User Level', 'Actual Skills', 'Recommended Skills', 'Recommended Course']
+
+
+def _flatten_result(row):
+    # Skill and course lists are joined for display/CSV
+    return row[:8] + tuple(', '.join(items) for items in row[8:])
+
+
+def export_results_csv(database):
+    """Write every result to a temporary CSV chunk by chunk and return the open file"""
+    f = tempfile.TemporaryFile(mode='w+b')
+    text = io.TextIOWrapper(f, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    writer.writerow(RESULT_HEADERS)
+    for row in database.iter_results():
+        writer.writerow(_flatten_result(row))
+    text.flush()
+    text.detach()
+    f.seek(0)
+    return f
+
+
+def admin_dashboard(database, page_size_options=(25, 50, 100, 500)):
+    # Only the admin view needs pandas and plotly, so they load on first use
+    import pandas as pd
+    import plotly.express as px
+
+    st.header("**User's👨‍💻 Data**")
+    st.text(f"Total records: {database.count_results()}")
+
+    # Keyset pagination, session_state keeps the starting ID of every page visited
+    page_size = st.selectbox("Rows per page", page_size_options, index=1)
+    page_starts = st.session_state.setdefault('admin_page_starts', [0])
+    rows = database.fetch_results(page_starts[-1], page_size)
+    st.dataframe(pd.DataFrame([_flatten_result(row) for row in rows], columns=RESULT_HEADERS))
+
+    prev_col, next_col = st.columns(2)
+    if prev_col.button("Previous page", disabled=len(page_starts) == 1):
+        page_starts.pop()
+        st.rerun()
+    if next_col.button("Next page", disabled=len(rows) < page_size):
+        page_starts.append(rows[-1][0])
+        st.rerun()
+
+    # The CSV is only generated when the button is clicked
+    st.download_button('Download Report', data=lambda: export_results_csv(database),
+                       file_name='User_Data.csv', mime='text/csv')
+
+    # Pie chart for predicted field recommendations
+    field_counts = database.count_by('Predicted_Field')
+    st.subheader("📈 **Pie-Chart for Predicted Field Recommendations**")
+    fig = px.pie(values=[count for _, count in field_counts], names=[label for label, _ in field_counts],
+                 title='Predicted Field according to the Skills')
+    st.plotly_chart(fig)
+
+    # Pie chart for User's👨‍💻 Experienced Level
+    counts = database.count_by('User_level')
+    st.subheader("📈 ** Pie-Chart for User's👨‍💻 Experienced Level**")
+    fig = px.pie(values=[count for _, count in counts], names=[label for label, _ in counts],
+                 title="Pie-Chart📈 for User's👨‍💻 Experienced Level")
+    st.plotly_chart(fig)
+
+    # Top skills, overall or for one predicted field
+    st.subheader("📈 **Top Skills**")
+    fields = [label for label, _ in field_counts if label]
+    field = st.selectbox("Predicted field", ['All fields'] + fields)
+    top = database.top_skills(None if field == 'All fields' else field)
+    # plotly rejects empty x/y lists, so an empty table gets a note instead
+    if top:
+        fig = px.bar(x=[skill for skill, _ in top], y=[count for _, count in top],
+                     labels={'x': 'Skill', 'y': 'Candidates'}, title='Most common skills')
+        st.plotly_chart(fig)
+    else:
+        st.info("No skills recorded yet.")
+
+    # Weekly volume and average resume score
+    st.subheader("📈 **Resume Score by Week**")
+    weeks = database.score_by_week()
+    if weeks:
+        fig = px.line(x=[week for week, _, _ in weeks], y=[float(avg) for _, _, avg in weeks],
+                      labels={'x': 'Week', 'y': 'Average score'}, markers=True,
+                      title='Average Resume Score per Week')
+        st.plotly_chart(fig)
+    else:
+        st.info("No resumes analyzed yet.")
 
+    resume_search()
+    job_matching(database)
 
-# Connection setup for database
-try:
-    connection = pymysql.connect(host='localhost', user='root', password='')
-    cursor = connection.cursor()
-except Exception as e:
-    st.error(f"Database connection error: {e}")
-    connection = None
-    cursor = None
 
+def resume_search(page_size=20):
+    from search_index import QueryError, get_search_index
 
-def insert_data(name, email, res_score, timestamp, no_of_pages, reco_field, cand_level, skills, recommended_skills,
-                courses):
-    if connection and cursor:
+    st.subheader("🔎 **Search Resumes**")
+    query = st.text_input("Search (AND / OR / NOT, \"exact phrase\", prefix*, skills:kotlin)")
+    if not query.strip():
+        return
+    # A new query starts again from the first page
+    if st.session_state.get('search_query') != query:
+        st.session_state['search_query'] = query
+        st.session_state['search_page'] = 1
+    page = st.session_state['search_page']
+    try:
+        total, results = get_search_index().search(query, page, page_size)
+    except QueryError as e:
+        st.error(f"Invalid search: {e}")
+        return
+    pages = max(1, -(-total // page_size))
+    st.text(f"{total} matching resumes, page {page} of {pages}")
+    for result in results:
+        st.markdown(f"**{result['name'] or 'Unknown'}** ({result['email']}) · {result['predicted_field']}  \n"
+                    f"{result['snippet']}")
+
+    prev_col, next_col = st.columns(2)
+    if prev_col.button("Previous results", disabled=page == 1):
+        st.session_state['search_page'] = page - 1
+        st.rerun()
+    if next_col.button("Next results", disabled=page >= pages):
+        st.session_state['search_page'] = page + 1
+        st.rerun()
+
+
+def job_matching(database):
+    # numpy/scipy load with the index, only when an admin opens this view
+    from matcher import get_match_index
+
+    st.subheader("🔎 **Match a Job Description**")
+    with st.form('job_matching'):
+        description = st.text_area("Job description")
+        top_k = st.number_input("Candidates", min_value=1, max_value=50, value=10)
+        submitted = st.form_submit_button("Find candidates")
+    if not submitted or not description.strip():
+        return
+    index = get_match_index()
+    hits = index.search(description, int(top_k))
+    if not hits:
+        st.info(f"No matching candidates among {len(index)} indexed resumes.")
+        return
+    rows = []
+    for rank, (fingerprint, score) in enumerate(hits, 1):
+        analysis = database.find_analysis(fingerprint) or {}
+        rows.append({'Rank': rank, 'Score': round(score, 4), 'Name': analysis.get('name', ''),
+                     'Email': analysis.get('email', ''), 'Predicted Field': analysis.get('predicted_field', ''),
+                     'Fingerprint': fingerprint})
+    st.dataframe(rows)
+
+
+# Connection setup for database (pool, schema and writer are created once per process)
+@st.cache_resource
+def _connect_db():
+    return get_database()
+
+
+def get_db():
+    # Failures aren't cached, so the next rerun tries to connect again
+    try:
+        return _connect_db()
+    except Exception as e:
+        print(f"Database connection error: {e}")
+        return None
+
+
+def insert_data(analysis, courses, document):
+    database = get_db()
+    if database:
+        row = result_row(analysis, courses, datetime.datetime.now(), document)
+        # Queued for the background writer, the page doesn't wait on the commit
+        database.writer.submit(row)
+    if document is not None:
+        from matcher import get_match_index
+        from search_index import get_search_index
         try:
-            DB_table_name = 'user_data'
-            insert_sql = "insert into " + DB_table_name + " values (0,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)"
-            rec_values = (name, email, str(res_score), timestamp, str(no_of_pages), reco_field, cand_level, skills,
-                          recommended_skills, courses)
-            cursor.execute(insert_sql, rec_values)
-            connection.commit()
+            get_match_index().add(analysis['fingerprint'], document['text'], analysis['skills'])
+            get_search_index().add(analysis, document['text'])
         except Exception as e:
-            st.error(f"Database error: {e}")
+            print(f"Error indexing resume: {e}")
+
+
+def find_near_duplicate(fingerprint, document):
+    # (earlier fingerprint, similarity) when this is an edited re-submission
+    from near_dup import get_near_duplicate_index
+    try:
+        index = get_near_duplicate_index()
+        if document is None:
+            return index.duplicate_of(fingerprint)
+        return index.check(fingerprint, document['text'])
+    except Exception as e:
+        print(f"Error checking near duplicates: {e}")
+        return None
+
+
+@st.cache_resource
+def load_logo(path='./Logo/SRA_Logo.jpg', size=(250, 250)):
+    # Opened and resized once per process instead of on every rerun
+    from PIL import Image
+    return Image.open(path).resize(size)
 
 
 def run():
@@ -165,72 +252,75 @@ def run():
     activities = ["Normal User", "Admin"]
     choice = st.sidebar.selectbox("Choose among the given options:", activities)
 
-    img = Image.open('./Logo/SRA_Logo.jpg')
-    img = img.resize((250, 250))
-    st.image(img)
-
-    # Create database and tables if connection exists
-    if connection and cursor:
-        db_sql = """CREATE DATABASE IF NOT EXISTS SRA;"""
-        cursor.execute(db_sql)
-        connection.select_db("resume_classifier")
-
-        # Create table
-        DB_table_name = 'user_data'
-        table_sql = "CREATE TABLE IF NOT EXISTS " + DB_table_name + """
-                (ID INT NOT NULL AUTO_INCREMENT,
-                 Name varchar(100) NOT NULL,
-                 Email_ID VARCHAR(50) NOT NULL,
-                 resume_score VARCHAR(8) NOT NULL,
-                 Timestamp VARCHAR(50) NOT NULL,
-                 Page_no VARCHAR(5) NOT NULL,
-                 Predicted_Field VARCHAR(25) NOT NULL,
-                 User_level VARCHAR(30) NOT NULL,
-                 Actual_skills VARCHAR(300) NOT NULL,
-                 Recommended_skills VARCHAR(300) NOT NULL,
-                 Recommended_courses VARCHAR(600) NOT NULL,
-                 PRIMARY KEY (ID));
-                """
-        cursor.execute(table_sql)
+    st.image(load_logo())
+
+    database = get_db()
+    if database is None:
+        st.error("Database connection error, results won't be saved.")
 
     if choice == 'Normal User':
+        from streamlit_tags import st_tags
         pdf_file = st.file_uploader("Choose your Resume", type=["pdf"])
         if pdf_file is not None:
-            save_image_path = './Uploaded_Resumes/' + pdf_file.name
-            with open(save_image_path, "wb") as f:
-                f.write(pdf_file.getbuffer())
-            show_pdf(save_image_path)
-
-            # Use our custom function instead of ResumeParser
-            resume_data = extract_resume_data(save_image_path)
-
-            if resume_data:
-                # Get the whole resume text
-                resume_text = pdf_reader(save_image_path)
-
+            # Parsed straight from memory, the copy on disk is written in the background
+            pdf_bytes = pdf_file.getvalue()
+            try:
+                check_upload(pdf_bytes)
+            except LimitExceeded as e:
+                st.error(str(e))
+                return
+            resume_hash = save_upload(pdf_bytes)
+            show_pdf(pdf_bytes, resume_hash)
+
+            # A resume seen before is served from the database without parsing it again.
+            # New ones are analyzed in a process of their own, within the limits; the result is
+            # kept in the session so widget reruns don't analyze it again
+            last = st.session_state.get('last_analysis')
+            if last and last[0] == resume_hash:
+                resume_data, document = last[1], last[2]
+            else:
+                try:
+                    resume_data, document = get_analysis(pdf_bytes, database, run=run_limited)
+                except (LimitExceeded, AnalysisFailed) as e:
+                    st.error(str(e))
+                    return
+                st.session_state['last_analysis'] = (resume_hash, resume_data, document)
+
+            # An unreadable PDF still gets an (empty) analysis, it is shown as
+            # an error and never stored
+            if resume_data and resume_data.get('no_of_pages'):
                 st.header("**Resume Analysis**")
                 st.success("Hello " + resume_data['name'])
+                near_duplicate = find_near_duplicate(resume_data['fingerprint'], document)
+                if near_duplicate:
+                    earlier = database.find_analysis(near_duplicate[0]) if database else None
+                    message = (f"This looks like a revised version of a resume analysed earlier "
+                               f"(similarity {near_duplicate[1]:.0%})")
+                    if earlier and 'resume_score' in earlier:
+                        message += f", which scored {earlier['resume_score']}"
+                    st.info(message + ".")
                 st.subheader("**Your Basic info**")
                 try:
                     st.text('Name: ' + resume_data['name'])
                     st.text('Email: ' + resume_data['email'])
                     st.text('Contact: ' + resume_data['mobile_number'])
+                    if resume_data.get('linkedin'):
+                        st.text('LinkedIn: ' + resume_data['linkedin'])
+                    if resume_data.get('github'):
+                        st.text('GitHub: ' + resume_data['github'])
                     st.text('Resume pages: ' + str(resume_data['no_of_pages']))
                 except:
                     pass
 
                 # Determine candidate level based on page count
-                cand_level = ''
-                if resume_data['no_of_pages'] == 1:
-                    cand_level = "Fresher"
+                cand_level = resume_data['user_level']
+                if cand_level == "Fresher":
                     st.markdown('''<h4 style='text-align: left; color: #d73b5c;'>You are looking Fresher.</h4>''',
                                 unsafe_allow_html=True)
-                elif resume_data['no_of_pages'] == 2:
-                    cand_level = "Intermediate"
+                elif cand_level == "Intermediate":
                     st.markdown('''<h4 style='text-align: left; color: #1ed760;'>You are at intermediate level!</h4>''',
                                 unsafe_allow_html=True)
-                elif resume_data['no_of_pages'] >= 3:
-                    cand_level = "Experienced"
+                elif cand_level == "Experienced":
                     st.markdown('''<h4 style='text-align: left; color: #fba171;'>You are at experience level!''',
                                 unsafe_allow_html=True)
 
@@ -239,161 +329,33 @@ def run():
                 keywords = st_tags(label='### Skills that you have', text='See our skills recommendation',
                                    value=resume_data['skills'], key='1')
 
-                # Field recommendation logic
-                ds_keyword = ['tensorflow', 'keras', 'pytorch', 'machine learning', 'deep Learning', 'flask',
-                              'streamlit']
-                web_keyword = ['react', 'django', 'node jS', 'react js', 'php', 'laravel', 'magento', 'wordpress',
-                               'javascript', 'angular js', 'c#', 'flask']
-                android_keyword = ['android', 'android development', 'flutter', 'kotlin', 'xml', 'kivy']
-                ios_keyword = ['ios', 'ios development', 'swift', 'cocoa', 'cocoa touch', 'xcode']
-                uiux_keyword = ['ux', 'adobe xd', 'figma', 'zeplin', 'balsamiq', 'ui', 'prototyping', 'wireframes',
-                                'storyframes', 'adobe photoshop', 'photoshop', 'editing', 'adobe illustrator',
-                                'illustrator', 'adobe after effects', 'after effects', 'adobe premier pro',
-                                'premier pro', 'adobe indesign', 'indesign', 'wireframe', 'solid', 'grasp',
-                                'user research', 'user experience']
-
-                recommended_skills = []
-                reco_field = ''
-                rec_course = ''
-
-                # Find skills and recommend based on keywords
-                for skill in resume_data['skills']:
-                    skill_lower = skill.lower()
-
-                    # Data science recommendation
-                    if skill_lower in ds_keyword:
-                        reco_field = 'Data Science'
-                        st.success("** Our analysis says you are looking for Data Science Jobs.**")
-                        recommended_skills = ['Data Visualization', 'Predictive Analysis', 'Statistical Modeling',
-                                              'Data Mining', 'Clustering & Classification', 'Data Analytics',
-                                              'Quantitative Analysis', 'Web Scraping', 'ML Algorithms', 'Keras',
-                                              'Pytorch', 'Probability', 'Scikit-learn', 'Tensorflow', "Flask",
-                                              'Streamlit']
-                        recommended_keywords = st_tags(label='### Recommended skills for you.',
-                                                       text='Recommended skills generated from System',
-                                                       value=recommended_skills, key='2')
-                        st.markdown(
-                            '''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to resume will boost🚀 the chances of getting a Job💼</h4>''',
-                            unsafe_allow_html=True)
-                        rec_course = course_recommender(ds_course)
-                        break
-
-                    # Web development recommendation
-                    elif skill_lower in web_keyword:
-                        reco_field = 'Web Development'
-                        st.success("** Our analysis says you are looking for Web Development Jobs **")
-                        recommended_skills = ['React', 'Django', 'Node JS', 'React JS', 'php', 'laravel', 'Magento',
-                                              'wordpress', 'Javascript', 'Angular JS', 'c#', 'Flask', 'SDK']
-                        recommended_keywords = st_tags(label='### Recommended skills for you.',
-                                                       text='Recommended skills generated from System',
-                                                       value=recommended_skills, key='3')
-                        st.markdown(
-                            '''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to resume will boost🚀 the chances of getting a Job💼</h4>''',
-                            unsafe_allow_html=True)
-                        rec_course = course_recommender(web_course)
-                        break
-
-                    # Android App Development
-                    elif skill_lower in android_keyword:
-                        reco_field = 'Android Development'
-                        st.success("** Our analysis says you are looking for Android App Development Jobs **")
-                        recommended_skills = ['Android', 'Android development', 'Flutter', 'Kotlin', 'XML', 'Java',
-                                              'Kivy', 'GIT', 'SDK', 'SQLite']
-                        recommended_keywords = st_tags(label='### Recommended skills for you.',
-                                                       text='Recommended skills generated from System',
-                                                       value=recommended_skills, key='4')
-                        st.markdown(
-                            '''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to resume will boost🚀 the chances of getting a Job💼</h4>''',
-                            unsafe_allow_html=True)
-                        rec_course = course_recommender(android_course)
-                        break
-
-                    # IOS App Development
-                    elif skill_lower in ios_keyword:
-                        reco_field = 'IOS Development'
-                        st.success("** Our analysis says you are looking for IOS App Development Jobs **")
-                        recommended_skills = ['IOS', 'IOS Development', 'Swift', 'Cocoa', 'Cocoa Touch', 'Xcode',
-                                              'Objective-C', 'SQLite', 'Plist', 'StoreKit', "UI-Kit", 'AV Foundation',
-                                              'Auto-Layout']
-                        recommended_keywords = st_tags(label='### Recommended skills for you.',
-                                                       text='Recommended skills generated from System',
-                                                       value=recommended_skills, key='5')
+                # Field recommendation, ranked by the analyzer
+                rec_course = []
+                field = FIELDS_BY_NAME.get(resume_data['predicted_field'])
+                if field:
+                    st.success("** Our analysis says you are looking for " + field['job_title'] + " Jobs **")
+                    recommended_keywords = st_tags(label='### Recommended skills for you.',
+                                                   text='Recommended skills generated from System',
+                                                   value=resume_data['recommended_skills'], key='2')
+                    st.markdown(
+                        '''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to resume will boost🚀 the chances of getting a Job💼</h4>''',
+                        unsafe_allow_html=True)
+                    rec_course = course_recommender(resume_data)
+
+                # Resume score calculation
+                st.subheader("**Resume Tips & Ideas💡**")
+                resume_score = resume_data['resume_score']
+                for section in SECTIONS:
+                    if not section['weight']:
+                        continue
+                    if resume_data['sections'].get(section['key']):
                         st.markdown(
-                            '''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to resume will boost🚀 the chances of getting a Job💼</h4>''',
+                            f"""<h4 style='text-align: left; color: #1ed760;'>{section['found_tip']}</h4>""",
                             unsafe_allow_html=True)
-                        rec_course = course_recommender(ios_course)
-                        break
-
-                    # UI-UX Recommendation
-                    elif skill_lower in uiux_keyword:
-                        reco_field = 'UI-UX Development'
-                        st.success("** Our analysis says you are looking for UI-UX Development Jobs **")
-                        recommended_skills = ['UI', 'User Experience', 'Adobe XD', 'Figma', 'Zeplin', 'Balsamiq',
-                                              'Prototyping', 'Wireframes', 'Storyframes', 'Adobe Photoshop', 'Editing',
-                                              'Illustrator', 'After Effects', 'Premier Pro', 'Indesign', 'Wireframe',
-                                              'Solid', 'Grasp', 'User Research']
-                        recommended_keywords = st_tags(label='### Recommended skills for you.',
-                                                       text='Recommended skills generated from System',
-                                                       value=recommended_skills, key='6')
+                    else:
                         st.markdown(
-                            '''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to resume will boost🚀 the chances of getting a Job💼</h4>''',
+                            f"""<h4 style='text-align: left; color: #fabc10;'>{section['missing_tip']}</h4>""",
                             unsafe_allow_html=True)
-                        rec_course = course_recommender(uiux_course)
-                        break
-
-                # Resume score calculation
-                st.subheader("**Resume Tips & Ideas💡**")
-                resume_score = 0
-
-                if 'Objective' in resume_text:
-                    resume_score += 20
-                    st.markdown(
-                        '''<h4 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Objective</h4>''',
-                        unsafe_allow_html=True)
-                else:
-                    st.markdown(
-                        '''<h4 style='text-align: left; color: #fabc10;'>[-] According to our recommendation please add your career objective, it will give your career intension to the Recruiters.</h4>''',
-                        unsafe_allow_html=True)
-
-                if 'Declaration' in resume_text:
-                    resume_score += 20
-                    st.markdown(
-                        '''<h4 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Delcaration✍/h4>''',
-                        unsafe_allow_html=True)
-                else:
-                    st.markdown(
-                        '''<h4 style='text-align: left; color: #fabc10;'>[-] According to our recommendation please add Declaration✍. It will give the assurance that everything written on your resume is true and fully acknowledged by you</h4>''',
-                        unsafe_allow_html=True)
-
-                if 'Hobbies' in resume_text or 'Interests' in resume_text:
-                    resume_score += 20
-                    st.markdown(
-                        '''<h4 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Hobbies⚽</h4>''',
-                        unsafe_allow_html=True)
-                else:
-                    st.markdown(
-                        '''<h4 style='text-align: left; color: #fabc10;'>[-] According to our recommendation please add Hobbies⚽. It will show your persnality to the Recruiters and give the assurance that you are fit for this role or not.</h4>''',
-                        unsafe_allow_html=True)
-
-                if 'Achievements' in resume_text:
-                    resume_score += 20
-                    st.markdown(
-                        '''<h4 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Achievements🏅 </h4>''',
-                        unsafe_allow_html=True)
-                else:
-                    st.markdown(
-                        '''<h4 style='text-align: left; color: #fabc10;'>[-] According to our recommendation please add Achievements🏅. It will show that you are capable for the required position.</h4>''',
-                        unsafe_allow_html=True)
-
-                if 'Projects' in resume_text:
-                    resume_score += 20
-                    st.markdown(
-                        '''<h4 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Projects👨‍💻 </h4>''',
-                        unsafe_allow_html=True)
-                else:
-                    st.markdown(
-                        '''<h4 style='text-align: left; color: #fabc10;'>[-] According to our recommendation please add Projects👨‍💻. It will show that you have done work related the required position or not.</h4>''',
-                        unsafe_allow_html=True)
 
                 # Resume Score Progress Bar
                 st.subheader("**Resume Score📝**")
@@ -406,37 +368,19 @@ def run():
                     </style>""",
                     unsafe_allow_html=True,
                 )
-                my_bar = st.progress(0)
-                score = 0
-                for percent_complete in range(resume_score):
-                    score += 1
-                    time.sleep(0.1)
-                    my_bar.progress(percent_complete + 1)
-
-                st.success('** Your Resume Writing Score: ' + str(score) + '**')
+                st.progress(resume_score)
+
+                st.success('** Your Resume Writing Score: ' + str(resume_score) + '**')
                 st.warning(
                     "** Note: This score is calculated based on the content that you have added in your Resume. **")
                 st.balloons()
 
-                # Insert data to database
-                if connection and cursor:
-                    ts = time.time()
-                    cur_date = datetime.datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
-                    cur_time = datetime.datetime.fromtimestamp(ts).strftime('%H:%M:%S')
-                    timestamp = str(cur_date + '_' + cur_time)
-
-                    insert_data(
-                        resume_data['name'],
-                        resume_data['email'],
-                        str(resume_score),
-                        timestamp,
-                        str(resume_data['no_of_pages']),
-                        reco_field,
-                        cand_level,
-                        str(resume_data['skills']),
-                        str(recommended_skills),
-                        str(rec_course)
-                    )
+                # Insert data to database, once per resume: reruns and repeat uploads
+                # find it already saved (or queued by this session)
+                saved = st.session_state.setdefault('saved_fingerprints', set())
+                if database and document is not None and resume_data['fingerprint'] not in saved:
+                    insert_data(resume_data, rec_course, document)
+                    saved.add(resume_data['fingerprint'])
 
                 # Display example video recommendations (without using pafy)
                 st.header("**Bonus Video for Resume Writing Tips💡**")
@@ -450,9 +394,6 @@ def run():
                 int_vid_title = fetch_yt_title(interview_vid)
                 st.subheader("✅ **" + int_vid_title + "**")
                 st.video(interview_vid)
-
-                if connection:
-                    connection.commit()
             else:
                 st.error('Something went wrong with resume parsing...')
     else:
@@ -464,39 +405,21 @@ def run():
 
         if st.button('Login'):
             if ad_user == 'machine_learning_hub' and ad_password == 'mlhub123':
-                st.success("Welcome Kushal")
-
-                # Display Data if database connection exists
-                if connection and cursor:
-                    cursor.execute('''SELECT * FROM user_data''')
-                    data = cursor.fetchall()
-
-                    st.header("**User's👨‍💻 Data**")
-                    df = pd.DataFrame(data, columns=['ID', 'Name', 'Email', 'Resume Score', 'Timestamp', 'Total Page',
-                                                     'Predicted Field', 'User Level', 'Actual Skills',
-                                                     'Recommended Skills',
-                                                     'Recommended Course'])
-                    st.dataframe(df)
-                    st.markdown(get_table_download_link(df, 'User_Data.csv', 'Download Report'), unsafe_allow_html=True)
-
-                    # Pie chart for predicted field recommendations
-                    labels = df.iloc[:, 6].unique()  # Predicted Field column
-                    values = df.iloc[:, 6].value_counts()
-                    st.subheader("📈 **Pie-Chart for Predicted Field Recommendations**")
-                    fig = px.pie(df, values=values, names=labels, title='Predicted Field according to the Skills')
-                    st.plotly_chart(fig)
-
-                    # Pie chart for User's👨‍💻 Experienced Level
-                    labels = df.iloc[:, 7].unique()  # User Level column
-                    values = df.iloc[:, 7].value_counts()
-                    st.subheader("📈 ** Pie-Chart for User's👨‍💻 Experienced Level**")
-                    fig = px.pie(df, values=values, names=labels, title="Pie-Chart📈 for User's👨‍💻 Experienced Level")
-                    st.plotly_chart(fig)
-                else:
-                    st.error("Database connection failed. Cannot display admin analytics.")
+                st.session_state['admin_logged_in'] = True
             else:
+                st.session_state['admin_logged_in'] = False
                 st.error("Wrong ID & Password Provided")
 
+        # Kept in the session so paging through the table doesn't log out
+        if st.session_state.get('admin_logged_in'):
+            st.success("Welcome Kushal")
+
+            # Display Data if database connection exists
+            if database:
+                admin_dashboard(database)
+            else:
+                st.error("Database connection failed. Cannot display admin analytics.")
+
 
 # Run the main application
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+"""Headless batch analysis of resume PDFs.
+
+Scores every PDF under the given paths on a process pool and streams the
+results to a JSONL or CSV file as they complete:
+
+    python batch.py Uploaded_Resumes/ -o results.jsonl
+    python batch.py archive/ -o results.csv --format csv --workers 8
+
+Successfully analyzed files are appended to a checkpoint (``<output>.done``
+by default), so an interrupted run picks up where it stopped when started
+again. Files that failed are recorded with their error and retried by the
+next run.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from analyzer import analyze_resume
+
+CSV_COLUMNS = ['path', 'name', 'email', 'mobile_number', 'linkedin', 'github', 'no_of_pages', 'user_level',
+               'predicted_field', 'resume_score', 'skills', 'error']
+
+
+def iter_pdf_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith('.pdf'):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def map_bounded(executor, func, items, window):
+    """Like executor.map, in completion order, with at most ``window`` items in
+    flight so 100k files don't all sit in memory as futures"""
+    pending = set()
+    for item in items:
+        if len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+        pending.add(executor.submit(func, item))
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+
+def analyze_path(path):
+    """Worker entry point, never raises so one bad PDF can't stop the run"""
+    try:
+        result = analyze_resume(path)
+        result['error'] = ''
+    except Exception as e:
+        result = {'error': f"{type(e).__name__}: {e}"}
+    result['path'] = path
+    return result
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+
+class ResultWriter:
+    """Append results to a JSONL or CSV file, flushing every record"""
+
+    def __init__(self, path, fmt):
+        self.fmt = fmt
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, 'a', encoding='utf-8', newline='')
+        if fmt == 'csv':
+            self.csv = csv.DictWriter(self.file, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+            if is_new:
+                self.csv.writeheader()
+
+    def write(self, result):
+        if self.fmt == 'csv':
+            row = dict(result)
+            row['skills'] = ';'.join(result.get('skills', []))
+            self.csv.writerow(row)
+        else:
+            self.file.write(json.dumps(result) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def run_batch(paths, output, fmt='jsonl', workers=None, checkpoint=None, progress_every=100):
+    checkpoint = checkpoint or output + '.done'
+    done = load_checkpoint(checkpoint)
+    todo = (path for path in iter_pdf_paths(paths) if path not in done)
+    workers = workers or os.cpu_count() or 1
+
+    writer = ResultWriter(output, fmt)
+    checkpoint_file = open(checkpoint, 'a', encoding='utf-8')
+    completed = 0
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in map_bounded(pool, analyze_path, todo, workers * 4):
+                writer.write(result)
+                # Only checkpoint once the result is on disk, and only if it
+                # succeeded: a failure may be transient, so it is retried on
+                # the next run
+                if not result['error']:
+                    checkpoint_file.write(result['path'] + '\n')
+                    checkpoint_file.flush()
+                completed += 1
+                if progress_every and completed % progress_every == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"{completed} done, {completed / elapsed:.2f} resumes/sec", file=sys.stderr)
+    finally:
+        writer.close()
+        checkpoint_file.close()
+
+    elapsed = time.perf_counter() - start
+    rate = completed / elapsed if elapsed else 0.0
+    print(f"Analyzed {completed} resumes ({len(done)} skipped) in {elapsed:.1f}s, {rate:.2f} resumes/sec",
+          file=sys.stderr)
+    return completed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score resume PDFs without the Streamlit UI")
+    parser.add_argument('paths', nargs='+', help="PDF files or directories to scan")
+    parser.add_argument('-o', '--output', required=True, help="results file (appended to)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--checkpoint', default=None, help="checkpoint file (default: <output>.done)")
+    args = parser.parse_args(argv)
+    run_batch(args.paths, args.output, args.format, args.workers, args.checkpoint)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Contact extraction: golden check and micro-benchmark.
+
+Checks extract_contact() against contact_golden.json, written by hand from
+the sample resumes in Uploaded_Resumes/ (the LinkedIn handle in
+NFC_RESUME has no linkedin.com URL, so it is expected empty), and checks
+that values straddling the header boundary come back whole. Then times it
+against the previous approach (compile both patterns and re.findall over the
+whole text on every call):
+
+    python benchmarks/bench_contact.py [--repeat 2000]
+
+Exits with status 1 on any mismatch.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from contact import extract_contact  # noqa: E402
+from resume_parser import ingest_pdf  # noqa: E402
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'contact_golden.json')
+# Pinned so the golden file doesn't depend on SRA_DEFAULT_COUNTRY_CODE
+COUNTRY_CODE = ''
+# Placed across the header boundary at every offset by check_boundary()
+BOUNDARY_VALUES = [('email', 'john.doe@gmail.com', 'john.doe@gmail.com'),
+                   ('phone', '+91 98765 43210', '+919876543210'),
+                   ('github', 'github.com/johndoe', 'https://github.com/johndoe')]
+
+
+def findall_contact(text):
+    """The extraction this module replaced, kept as the baseline"""
+    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    phones = re.findall(r'(\+\d{1,3}[-.\s]??)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
+    return emails[0] if emails else "", phones[0] if phones else ""
+
+
+def load_samples():
+    samples = {}
+    for path in sorted(glob.glob(os.path.join(ROOT, 'Uploaded_Resumes', '*.pdf'))):
+        samples[os.path.basename(path)] = ingest_pdf(path)['text']
+    return samples
+
+
+def check(samples, golden):
+    failures = 0
+    for name, text in samples.items():
+        if name not in golden:
+            print(f"{name}: not in the golden file")
+            failures += 1
+            continue
+        got = extract_contact(text, default_country_code=COUNTRY_CODE)
+        for key, expected in golden[name].items():
+            if got[key] != expected:
+                print(f"{name}: {key} is {got[key]!r}, expected {expected!r}")
+                failures += 1
+    return failures
+
+
+def check_boundary(header_chars=100):
+    failures = 0
+    for key, written, expected in BOUNDARY_VALUES:
+        for start in range(header_chars - len(written), header_chars + 1):
+            text = 'x ' * (start // 2) + ' ' * (start % 2) + written + ' and more text\nnext line'
+            got = extract_contact(text, header_chars, COUNTRY_CODE)[key]
+            if got != expected:
+                print(f"{key} at offset {start}: {got!r}, expected {expected!r}")
+                failures += 1
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    samples = load_samples()
+    with open(GOLDEN_PATH, encoding='utf-8') as f:
+        golden = json.load(f)
+    failures = check(samples, golden) + check_boundary()
+
+    print(f"{'resume':<40} {'findall us':>11} {'contact us':>11}")
+    for name, text in samples.items():
+        old = min(timeit.repeat(lambda: findall_contact(text), number=args.repeat, repeat=3)) / args.repeat
+        new = min(timeit.repeat(lambda: extract_contact(text), number=args.repeat, repeat=3)) / args.repeat
+        print(f"{name[:40]:<40} {old * 1e6:>11.1f} {new * 1e6:>11.1f}")
+
+    if failures:
+        print(f"{failures} mismatches")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
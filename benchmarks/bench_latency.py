@@ -0,0 +1,73 @@
+"""Per-request latency check.
+
+Times analyze_resume() on each sample resume with a cold ingest cache and
+compares it with the bare pdfplumber parse of the same file. Whatever is
+left over is fixed per-request overhead (sleeps, downloads, ...) and must
+stay under the budget:
+
+    python benchmarks/bench_latency.py [--budget-ms 50]
+
+Exits with status 1 when the budget is exceeded.
+"""
+import argparse
+import glob
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Runs are made cold by clearing the memory cache, so keep the disk caches off
+os.environ['SRA_INGEST_CACHE_DIR'] = ''
+os.environ['SRA_OCR_CACHE_DIR'] = ''
+
+import pdfplumber  # noqa: E402
+
+import resume_parser  # noqa: E402
+from analyzer import analyze_resume  # noqa: E402
+
+REPEAT = 3
+
+
+def parse_only(data):
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [page.extract_text() for page in pdf.pages]
+
+
+def best_of(func, *args):
+    best = float('inf')
+    for _ in range(REPEAT):
+        resume_parser._ingest_cache.clear()
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget-ms', type=float, default=50.0)
+    parser.add_argument('pdfs', nargs='*', default=sorted(glob.glob(os.path.join(ROOT, 'Uploaded_Resumes', '*.pdf'))))
+    args = parser.parse_args(argv)
+
+    worst = 0.0
+    print(f"{'resume':<45} {'parse ms':>9} {'total ms':>9} {'extra ms':>9}")
+    for path in args.pdfs:
+        with open(path, 'rb') as f:
+            data = f.read()
+        parse = best_of(parse_only, data)
+        total = best_of(analyze_resume, data)
+        extra = max(total - parse, 0.0)
+        worst = max(worst, extra)
+        print(f"{os.path.basename(path)[:45]:<45} {parse * 1000:>9.1f} {total * 1000:>9.1f} {extra * 1000:>9.1f}")
+
+    if worst * 1000 > args.budget_ms:
+        print(f"FAIL: {worst * 1000:.1f} ms of per-request overhead exceeds the {args.budget_ms} ms budget")
+        return 1
+    print(f"OK: worst overhead {worst * 1000:.1f} ms (budget {args.budget_ms} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
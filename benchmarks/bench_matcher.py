@@ -0,0 +1,145 @@
+"""Job description matching at corpus scale.
+
+Builds a synthetic index of hashed resume rows (Zipf distributed feature
+ids, a few hundred distinct terms per row like a real resume), opens it the
+way the app does (memory-mapped) and times top-K queries on one core:
+
+    python benchmarks/bench_matcher.py [--docs 200000] [--terms 600] [--budget-ms 1000]
+
+Also reports featurization and incremental append cost on the sample
+resumes. Exits with status 1 when the p95 single-query latency is over
+budget.
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+# One core, as in the target deployment
+for _var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(_var, '1')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import scipy.sparse as sp  # noqa: E402
+
+from matcher import N_FEATURES, MatchIndex, Segment, featurize  # noqa: E402
+from resume_parser import ingest_pdf  # noqa: E402
+
+QUERIES = [
+    "Senior Android developer with Kotlin, Java and Jetpack experience, REST APIs and Git",
+    "Data scientist: Python, machine learning, TensorFlow, SQL, statistics and data visualization",
+    "Frontend web developer, React, JavaScript, HTML, CSS, Node.js, MongoDB",
+    "UI/UX designer with Figma, Adobe XD, wireframes, prototyping and user research",
+    "iOS engineer, Swift, Xcode, Cocoa Touch, Core Data",
+    "DevOps engineer: Docker, Kubernetes, AWS, Linux, CI/CD pipelines",
+]
+SEGMENT_ROWS = 25000
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))]
+
+
+def synthetic_rows(rng, n_rows, terms, permutation):
+    """CSR block of n_rows unit-norm rows with Zipf distributed feature ids"""
+    ids = permutation[np.minimum(rng.zipf(1.15, size=n_rows * terms), N_FEATURES) - 1]
+    data = (1 + np.log(rng.integers(1, 6, size=n_rows * terms))).astype(np.float32)
+    indptr = np.arange(0, n_rows * terms + 1, terms, dtype=np.int32)
+    matrix = sp.csr_matrix((data, ids.astype(np.int32), indptr), shape=(n_rows, N_FEATURES))
+    matrix.sum_duplicates()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    matrix = sp.diags(1 / norms.astype(np.float32)) @ matrix
+    matrix.indptr = matrix.indptr.astype(np.int32)
+    return matrix.tocsr()
+
+
+def build_synthetic(path, n_docs, terms, seed=0):
+    rng = np.random.default_rng(seed)
+    # Common terms (low Zipf ranks) land on the buckets real queries hit
+    permutation = rng.permutation(N_FEATURES)
+    for query in QUERIES:
+        ids, _ = featurize(query)
+        permutation[:len(ids)] = ids
+    names = []
+    for start in range(0, n_docs, SEGMENT_ROWS):
+        rows = min(SEGMENT_ROWS, n_docs - start)
+        matrix = synthetic_rows(rng, rows, terms, permutation)
+        fingerprints = [f'{start + i:064x}' for i in range(rows)]
+        names.append(Segment.write(path, f'seg-{start:010d}', fingerprints, matrix).name)
+    index = MatchIndex(path)
+    index.segments = [Segment(os.path.join(path, name)) for name in names]
+    index._write_manifest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, default=200000)
+    parser.add_argument('--terms', type=int, default=600, help="feature draws per row, before dedup")
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=1000.0)
+    args = parser.parse_args(argv)
+
+    paths = sorted(glob.glob(os.path.join(ROOT, 'Uploaded_Resumes', '*.pdf')))
+    samples = [ingest_pdf(path)['text'] for path in paths]
+    start = time.perf_counter()
+    for text in samples:
+        featurize(text)
+    print(f"featurize: {(time.perf_counter() - start) / len(samples) * 1000:.2f} ms per sample resume")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        build_synthetic(tmp, args.docs, args.terms)
+        print(f"built {args.docs} synthetic rows in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        index = MatchIndex(tmp, flush_every=len(samples), merge_factor=64)
+        nnz = sum(segment.matrix.nnz for segment in index.segments)
+        print(f"open (memory-mapped): {(time.perf_counter() - start) * 1000:.0f} ms, "
+              f"{nnz / 1e6:.1f}M non-zeros ({nnz / args.docs:.0f} per row) in {len(index.segments)} segments")
+
+        # Incremental append: buffered rows, then one new segment
+        start = time.perf_counter()
+        for number, text in enumerate(samples):
+            index.add(f'sample-{number}', text)
+        print(f"append {len(samples)} resumes + flush: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        single = []
+        for _ in range(args.repeat):
+            for query in QUERIES:
+                start = time.perf_counter()
+                hits = index.search(query, args.k)
+                single.append(time.perf_counter() - start)
+        assert hits, "synthetic corpus produced no matches"
+
+        batched = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            index.search_many(QUERIES, args.k)
+            batched.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        index.compact()
+        compact_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        index.search(QUERIES[0], args.k)
+        compacted = time.perf_counter() - start
+
+    p95 = percentile(single, 95) * 1000
+    print(f"single query: p50 {percentile(single, 50) * 1000:.0f} ms, p95 {p95:.0f} ms")
+    print(f"batch of {len(QUERIES)}: p50 {percentile(batched, 50) * 1000:.0f} ms "
+          f"({percentile(batched, 50) / len(QUERIES) * 1000:.0f} ms per query)")
+    print(f"compact: {compact_seconds:.1f}s, query after compaction {compacted * 1000:.0f} ms")
+    if p95 > args.budget_ms:
+        print(f"Over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
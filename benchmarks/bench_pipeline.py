@@ -0,0 +1,150 @@
+"""End-to-end pipeline benchmark with per-stage latency and memory.
+
+Runs the analysis pipeline over the sample resumes in Uploaded_Resumes/ plus
+synthetic multi-page resumes and reports, for each stage, p50/p95 latency,
+throughput and peak traced memory:
+
+    python benchmarks/bench_pipeline.py [--repeat 3] [--pages 1 3 10]
+
+Latencies come from the instrumentation timers wired into the pipeline, so
+the numbers match what production sinks would record.
+"""
+import argparse
+import datetime
+import glob
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Runs are made cold by clearing the memory cache, so keep the disk caches off
+os.environ['SRA_INGEST_CACHE_DIR'] = ''
+os.environ['SRA_OCR_CACHE_DIR'] = ''
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import resume_parser  # noqa: E402
+import storage  # noqa: E402
+from analyzer import analyze_resume  # noqa: E402
+from contact import extract_contact  # noqa: E402
+from db import Database  # noqa: E402
+from fields import classify_fields  # noqa: E402
+from instrumentation import MemorySink, add_sink, remove_sink, timer  # noqa: E402
+from sections import detect_sections, score_sections  # noqa: E402
+from skills import match_skills  # noqa: E402
+from synthetic import synthetic_resume  # noqa: E402
+
+STAGES = ['pdf_parse', 'contact', 'skills', 'classify', 'sections', 'db_insert', 'preview']
+
+
+def build_corpus(page_counts):
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(ROOT, 'Uploaded_Resumes', '*.pdf'))):
+        with open(path, 'rb') as f:
+            corpus.append((os.path.basename(path), f.read()))
+    for seed, pages in enumerate(page_counts):
+        corpus.append((f'synthetic-{pages}p', synthetic_resume(pages, seed=seed)))
+    return corpus
+
+
+def to_row(result):
+    return {
+        'name': result['name'], 'email': result['email'], 'resume_score': result['resume_score'],
+        'no_of_pages': result['no_of_pages'], 'created_at': datetime.datetime.now(),
+        'predicted_field': result['predicted_field'], 'user_level': result['user_level'],
+        'skills': result['skills'], 'recommended_skills': result['recommended_skills'], 'courses': [],
+    }
+
+
+def run_pipeline(data, database):
+    resume_parser._ingest_cache.clear()
+    result = analyze_resume(data)
+    database.insert_results([to_row(result)])
+    with timer('preview'):
+        uncached_thumbnail(data)
+    return result
+
+
+def uncached_thumbnail(data):
+    storage._thumbnails.clear()
+    return storage.render_thumbnail(data)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def stage_calls(data, database):
+    """Standalone callables for each stage, used for memory tracing"""
+    doc = resume_parser.ingest_pdf(data)
+    text = doc['text']
+    hits = match_skills(text)
+    result = analyze_resume(data)
+    return {
+        'pdf_parse': lambda: list(resume_parser.iter_pages(data)),
+        'contact': lambda: extract_contact(text),
+        'skills': lambda: match_skills(text),
+        'classify': lambda: classify_fields(hits),
+        'sections': lambda: score_sections(text, detect_sections(text)),
+        'db_insert': lambda: database.insert_results([to_row(result)]),
+        'preview': lambda: uncached_thumbnail(data),
+    }
+
+
+def measure_memory(corpus, database):
+    peaks = dict.fromkeys(STAGES, 0)
+    tracemalloc.start()
+    try:
+        for _, data in corpus:
+            for stage, call in stage_calls(data, database).items():
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                call()
+                peaks[stage] = max(peaks[stage], tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--pages', type=int, nargs='*', default=[1, 3, 10])
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(args.pages)
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database('sqlite', sqlite_path=os.path.join(tmp, 'bench.db'))
+        database.init_schema()
+
+        sink = add_sink(MemorySink())
+        start = time.perf_counter()
+        try:
+            for _ in range(args.repeat):
+                for _, data in corpus:
+                    run_pipeline(data, database)
+        finally:
+            remove_sink(sink)
+        elapsed = time.perf_counter() - start
+        peaks = measure_memory(corpus, database)
+        database.close()
+
+    runs = args.repeat * len(corpus)
+    print(f"Corpus: {len(corpus)} resumes ({', '.join(name for name, _ in corpus)}), {args.repeat} rounds")
+    print(f"End to end: {runs / elapsed:.2f} resumes/sec\n")
+    print(f"{'stage':<10} {'p50 ms':>9} {'p95 ms':>9} {'ops/sec':>9} {'peak KiB':>9}")
+    for stage in STAGES:
+        timings = sink.timings.get(stage, [])
+        if not timings:
+            continue
+        ops = len(timings) / sum(timings) if sum(timings) else float('inf')
+        print(f"{stage:<10} {percentile(timings, 50) * 1000:>9.2f} {percentile(timings, 95) * 1000:>9.2f} "
+              f"{ops:>9.1f} {peaks[stage] / 1024:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
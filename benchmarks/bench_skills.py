@@ -0,0 +1,90 @@
+"""Skill matcher scaling benchmark.
+
+Compares the compiled SkillMatcher against the old per-keyword substring scan
+as the vocabulary grows, after checking that the default vocabulary doesn't
+pick skills out of ordinary prose. Run from the repository root:
+
+    python benchmarks/bench_skills.py
+
+Exits with status 1 if a sentence in PROSE yields a skill.
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills import SKILL_KEYWORDS, SkillMatcher, match_skills  # noqa: E402
+
+VOCAB_SIZES = [35, 500, 2000, 5000, 10000]
+TEXT_WORDS = 4000
+REPEAT = 5
+# Everyday English that contains field keywords, none of it is a skill
+PROSE = [
+    "I have a solid grasp of data structures and strong editing skills.",
+    "Editing the team newsletter gave me a solid understanding of deadlines.",
+]
+
+
+def synthetic_vocabulary(size, rng):
+    vocab = list(SKILL_KEYWORDS)
+    while len(vocab) < size:
+        words = rng.randint(1, 3)
+        vocab.append(' '.join(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+                              for _ in range(words)))
+    return vocab
+
+
+def synthetic_text(vocab, rng):
+    filler = ['developed', 'team', 'the', 'with', 'using', 'project', 'and', 'built', 'for', 'experience']
+    words = [rng.choice(vocab) if rng.random() < 0.05 else rng.choice(filler) for _ in range(TEXT_WORDS)]
+    return ' '.join(words)
+
+
+def substring_scan(vocab, text):
+    lowered = text.lower()
+    return [skill for skill in vocab if skill in lowered]
+
+
+def best_of(func, *args):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_prose():
+    failures = 0
+    for sentence in PROSE:
+        found = list(match_skills(sentence))
+        if found:
+            print(f"{sentence!r}: found {found}, expected no skills")
+            failures += 1
+    return failures
+
+
+def main():
+    failures = check_prose()
+    rng = random.Random(42)
+    print(f"{'vocab':>7} {'build ms':>9} {'match ms':>9} {'scan ms':>9}")
+    for size in VOCAB_SIZES:
+        vocab = synthetic_vocabulary(size, rng)
+        text = synthetic_text(vocab, rng)
+        start = time.perf_counter()
+        matcher = SkillMatcher(vocab)
+        build = time.perf_counter() - start
+        match = best_of(matcher.find, text)
+        scan = best_of(substring_scan, vocab, text)
+        print(f"{size:>7} {build * 1000:>9.1f} {match * 1000:>9.2f} {scan * 1000:>9.2f}")
+
+    if failures:
+        print(f"{failures} false positives")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Import-time budget for app.py.
+
+Streamlit re-runs app.py on every interaction and the first run pays for
+every module it imports. This imports app in a fresh interpreter (after
+streamlit itself, which we don't control), reports the best of a few runs
+and checks that no branch-specific heavy module was pulled in eagerly:
+
+    python benchmarks/import_time.py [--budget-ms 150] [--runs 5]
+
+Exits with status 1 when the budget is exceeded or a lazy module leaked
+into the top-level imports.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only the branch that uses them may import these
+LAZY_MODULES = {
+    'pandas': 'admin dashboard',
+    'plotly.express': 'admin dashboard',
+    'pdfplumber': 'PDF parser',
+    'pymysql': 'MySQL backend',
+    'scipy': 'job matcher',
+    'streamlit_tags': 'normal user view',
+}
+
+PROBE = """
+import json, sys, time
+import streamlit
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+
+def measure_once():
+    out = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, capture_output=True, text=True,
+                         check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget-ms', type=float, default=150.0)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = [measure_once() for _ in range(args.runs)]
+    best = min(result['seconds'] for result in results) * 1000
+    leaked = sorted(name for name in LAZY_MODULES if name in results[0]['modules'])
+
+    print(f"import app: {best:.1f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    for name in leaked:
+        print(f"  {name} is imported eagerly, only the {LAZY_MODULES[name]} needs it")
+
+    if best > args.budget_ms or leaked:
+        print("Import-time budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
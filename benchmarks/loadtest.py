@@ -0,0 +1,213 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Drives N simulated sessions at once through app.py with Streamlit's AppTest,
+all in this one process the way one server hosts them. A Normal User flow
+uploads a fresh synthetic resume (every upload is a cold analysis) and moves
+the course slider; an Admin flow opens the dashboard. Everything runs
+against a throwaway SQLite database and index files:
+
+    python benchmarks/loadtest.py [--sessions 1 2 4 8] [--flows 4] [--admin-share 0.25] [--pages 2]
+
+For each N it reports throughput, p50/p95 flow latency per role and the RSS
+of the server process and of its child processes (the forkserver analyses
+start from, plus any analysis still running). The limits from
+limits.py apply as configured, e.g. SRA_MAX_CONCURRENT_ANALYSES=2; uploads
+turned away by a limit are counted as rejected. Exits with status 1 if any
+flow raised an exception.
+"""
+import argparse
+import atexit
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import synthetic_resume  # noqa: E402
+
+# Runs as each session's script. The uploader returns the resume the
+# session was given; the guard keeps child processes from running the app.
+APP_SCRIPT = """
+import io
+import streamlit as st
+
+class Upload(io.BytesIO):
+    name = 'resume.pdf'
+
+st.file_uploader = lambda *args, **kwargs: (Upload(st.session_state['loadtest_pdf'])
+                                             if 'loadtest_pdf' in st.session_state else None)
+
+import app
+if __name__ == '__main__':
+    app.run()
+"""
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))]
+
+
+def seconds(values, pct, width):
+    return f"{percentile(values, pct):.2f}s".rjust(width) if values else '-'.rjust(width)
+
+
+def rss_mb(pid='self'):
+    """Resident set size from /proc (Linux), 0 where it isn't available"""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / 1024 / 1024
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+def descendants(pid):
+    """Every process below ``pid``, from the parent ids in /proc (Linux)"""
+    parents = {}
+    try:
+        names = os.listdir('/proc')
+    except OSError:
+        return []
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                # The command name may contain spaces, the fields after it don't
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(name))
+    found = []
+    stack = [pid]
+    while stack:
+        children = parents.get(stack.pop(), [])
+        found += children
+        stack += children
+    return found
+
+
+def children_rss_mb():
+    return sum(rss_mb(child) for child in descendants(os.getpid()))
+
+
+def outcome(at):
+    if at.exception:
+        return 'error'
+    # Limit messages and parse failures are shown with st.error
+    return 'rejected' if at.error else 'ok'
+
+
+def user_flow(pdf, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_string(APP_SCRIPT, default_timeout=timeout)
+    at.session_state['loadtest_pdf'] = pdf
+    at.run()
+    if outcome(at) == 'ok':
+        # A widget change reruns the whole script
+        at.slider[0].set_value(6).run()
+    return at
+
+
+def admin_flow(timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_string(APP_SCRIPT, default_timeout=timeout)
+    at.session_state['admin_logged_in'] = True
+    at.run()
+    at.sidebar.selectbox[0].select('Admin').run()
+    return at
+
+
+def run_level(n_sessions, flows, admin_share, pages, timeout, seed):
+    """Run n_sessions threads of ``flows`` flows each, return (records, wall seconds)"""
+    records = []
+    lock = threading.Lock()
+
+    def session(number):
+        rng = random.Random(seed * 1000 + number)
+        for flow in range(flows):
+            role = 'admin' if rng.random() < admin_share else 'user'
+            start = time.perf_counter()
+            try:
+                if role == 'admin':
+                    result = outcome(admin_flow(timeout))
+                else:
+                    pdf = synthetic_resume(pages, seed=rng.getrandbits(48))
+                    result = outcome(user_flow(pdf, timeout))
+            except Exception as e:
+                print(f"Session {number} flow {flow}: {e}", file=sys.stderr)
+                result = 'error'
+            with lock:
+                records.append((role, result, time.perf_counter() - start))
+
+    threads = [threading.Thread(target=session, args=(number,)) for number in range(n_sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return records, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, nargs='*', default=[1, 2, 4, 8])
+    parser.add_argument('--flows', type=int, default=4, help="flows per session")
+    parser.add_argument('--admin-share', type=float, default=0.25)
+    parser.add_argument('--pages', type=int, default=2, help="pages per synthetic resume")
+    parser.add_argument('--timeout', type=float, default=120.0, help="AppTest timeout per script run")
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix='sra-loadtest-')
+    # Registered first so it runs last, after the app's exit-time flushes
+    atexit.register(shutil.rmtree, tmp, ignore_errors=True)
+    # Read at import time by the app's modules, so set before the first run
+    os.environ.update({
+        'SRA_DB_BACKEND': 'sqlite',
+        'SRA_SQLITE_PATH': os.path.join(tmp, 'sra.db'),
+        'SRA_UPLOAD_DIR': os.path.join(tmp, 'uploads'),
+        'SRA_SEARCH_DB': os.path.join(tmp, 'search_index.db'),
+        'SRA_MATCH_INDEX_DIR': os.path.join(tmp, 'match_index'),
+        'SRA_NEAR_DUP_DB': os.path.join(tmp, 'near_dup.db'),
+        'SRA_INGEST_CACHE_DIR': os.path.join(tmp, 'cache', 'ingest'),
+        'SRA_OCR_CACHE_DIR': os.path.join(tmp, 'cache', 'ocr'),
+    })
+    os.chdir(ROOT)
+
+    # Imports, cached resources and worker start-up aren't part of the numbers
+    user_flow(synthetic_resume(args.pages, seed=-1), args.timeout)
+    admin_flow(args.timeout)
+
+    import limits
+    print(f"limits: {limits.MAX_CONCURRENT_ANALYSES} concurrent analyses, {limits.ANALYSIS_TIMEOUT:g}s timeout, "
+          f"{limits.MAX_UPLOAD_MB:g} MB uploads")
+    print(f"{'sessions':>8} {'flows':>6} {'ok':>4} {'rej':>4} {'err':>4} {'flows/s':>8} {'user p50':>9} "
+          f"{'user p95':>9} {'admin p50':>10} {'admin p95':>10} {'rss MB':>8} {'children MB':>12}")
+    failed = False
+    for level, n_sessions in enumerate(args.sessions):
+        records, wall = run_level(n_sessions, args.flows, args.admin_share, args.pages, args.timeout, level)
+        counts = {result: sum(1 for _, r, _ in records if r == result) for result in ('ok', 'rejected', 'error')}
+        latency = {role: [elapsed for r, result, elapsed in records if r == role and result == 'ok']
+                   for role in ('user', 'admin')}
+        failed = failed or counts['error'] > 0
+        print(f"{n_sessions:>8} {len(records):>6} {counts['ok']:>4} {counts['rejected']:>4} {counts['error']:>4} "
+              f"{counts['ok'] / wall:>8.2f} {seconds(latency['user'], 50, 9)} {seconds(latency['user'], 95, 9)} "
+              f"{seconds(latency['admin'], 50, 10)} {seconds(latency['admin'], 95, 10)} "
+              f"{rss_mb():>8.0f} {children_rss_mb():>12.0f}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
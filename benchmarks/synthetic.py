@@ -0,0 +1,68 @@
+"""Synthetic resume PDFs for benchmarks.
+
+Writes small but valid text PDFs (Helvetica, one text object per page) so the
+benchmarks don't need a PDF library beyond pdfplumber for reading.
+"""
+import random
+
+SECTION_HEADINGS = ['Objective', 'Skills', 'Work Experience', 'Projects', 'Achievements', 'Education',
+                    'Hobbies', 'Declaration']
+SKILLS = ['Python', 'Java', 'JavaScript', 'React', 'Django', 'Flask', 'SQL', 'Docker', 'Kubernetes', 'AWS',
+          'Machine Learning', 'TensorFlow', 'Kotlin', 'Swift', 'Figma', 'Photoshop', 'Git', 'Linux']
+FILLER = ('developed designed implemented maintained improved delivered the a new scalable service platform '
+          'application team customers using with for and data pipeline feature reporting system').split()
+
+LINES_PER_PAGE = 48
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(pages):
+    """Build a PDF from a list of pages, each a list of text lines"""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_ids = []
+    for lines in pages:
+        stream = ['BT /F1 10 Tf 12 TL 50 770 Td']
+        stream += [f'({_escape(line)}) Tj T*' for line in lines]
+        stream.append('ET')
+        content = '\n'.join(stream).encode('latin-1', 'replace')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(content), content))
+        content_id = len(objects)
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_id)
+        page_ids.append(len(objects))
+    kids = b' '.join(b'%d 0 R' % page_id for page_id in page_ids)
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def resume_lines(rng, n_pages):
+    lines = [f'Candidate {rng.randint(1000, 9999)}',
+             f'candidate{rng.randint(1, 99999)}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}']
+    total = n_pages * LINES_PER_PAGE
+    while len(lines) < total:
+        lines.append(rng.choice(SECTION_HEADINGS))
+        for _ in range(rng.randint(4, 12)):
+            words = [rng.choice(FILLER) for _ in range(rng.randint(8, 14))]
+            words.insert(rng.randrange(len(words)), rng.choice(SKILLS))
+            lines.append(' '.join(words))
+    return lines[:total]
+
+
+def synthetic_resume(n_pages, seed=0):
+    rng = random.Random(seed)
+    lines = resume_lines(rng, n_pages)
+    return make_pdf([lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)])
@@ -0,0 +1,113 @@
+"""LRU cache keyed by a content hash, with an optional directory mirror.
+
+Parsed PDFs (resume_parser.py) and OCR text (ocr.py) are cached this way:
+the last ``size`` entries stay in memory, and when ``directory`` is set every
+entry is also written there as ``<key><suffix>`` so other processes and
+restarts can reuse it. The directory keeps about ``max_files`` entries: reads
+touch a file, and the least recently used files are removed as new ones are
+written (0 = unbounded). Streamlit serves sessions from threads, so the
+in-memory part is guarded by a lock; files are written to a temporary name
+and renamed into place.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+
+class ContentCache:
+    def __init__(self, size, directory='', suffix='', load=None, dump=None, label='cache', max_files=0):
+        self.size = size
+        self.directory = directory
+        self.suffix = suffix
+        self.max_files = max_files
+        # load(f) / dump(value, f) on text files, plain strings by default
+        self.load = load or (lambda f: f.read())
+        self.dump = dump or (lambda value, f: f.write(value))
+        self.label = label
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Scanning the directory is O(files), so it is pruned every
+        # max_files / 10 writes rather than on each one
+        self._writes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Empty the memory cache, files on disk are kept"""
+        with self._lock:
+            self._entries.clear()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        """The cached value, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                value = self.load(f)
+            # Marks the file as recently used for prune()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if not self.directory:
+            return
+        path = self._path(key)
+        # Unique per writer, two threads may store the same key at once
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                self.dump(value, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing {self.label} entry: {e}")
+            return
+        if self.max_files:
+            with self._lock:
+                due = self._writes % max(1, self.max_files // 10) == 0
+                self._writes += 1
+            if due:
+                self.prune()
+
+    def prune(self):
+        """Remove the least recently used files over max_files, returns how many"""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(self.suffix)]
+        except FileNotFoundError:
+            return 0
+        entries = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((os.stat(path).st_mtime, path))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+        removed = 0
+        for _, path in entries[:max(0, len(entries) - self.max_files)]:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
@@ -0,0 +1,95 @@
+"""Contact details from resume text: email, phone, LinkedIn and GitHub.
+
+Patterns are compiled once. Each one is scanned over the header region
+first (contact details almost always sit at the top) and stops at the first
+valid hit; the rest of the document is only read when the header has none.
+Phone numbers written with a country code come back in E.164 form. Without
+one they keep their national digits, unless SRA_DEFAULT_COUNTRY_CODE says
+which country every resume comes from.
+"""
+import os
+import re
+
+# Characters from the top of the document searched before the rest,
+# rounded up to the end of the line
+HEADER_CHARS = int(os.environ.get('SRA_CONTACT_HEADER_CHARS', 1500))
+# Empty: nothing is assumed about numbers written without a country code
+DEFAULT_COUNTRY_CODE = os.environ.get('SRA_DEFAULT_COUNTRY_CODE', '')
+
+# Patterns start on a literal or a narrow character class where possible,
+# they run over the whole document when the header has no match
+EMAIL_RE = re.compile(r'(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+# Digits with the usual separators, never across a line break
+PHONE_RE = re.compile(r'(?<![\w+])[+(\d][\d \t().-]{6,20}\d(?!\w)')
+LINKEDIN_RE = re.compile(r'(?i:linkedin)\.com/((?:in/|pub/)?[A-Za-z0-9_%-]+)')
+GITHUB_RE = re.compile(r'(?i:github)\.com/([A-Za-z0-9][A-Za-z0-9-]{0,38})')
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_phone(raw, default_country_code=DEFAULT_COUNTRY_CODE):
+    """E.164 form of a phone number as written in a resume.
+
+    A national number (10 digits, or 11 with a trunk 0) without a country
+    code comes back as its digits, or in E.164 with ``default_country_code``
+    when one is given. Returns '' if it isn't a phone number.
+    """
+    raw = raw.strip()
+    digits = _NON_DIGITS.sub('', raw)
+    if raw.startswith('+'):
+        pass
+    elif digits.startswith('00'):
+        # International call prefix
+        digits = digits[2:]
+    else:
+        # Drop a trunk prefix ("0" + 10 digits) before adding the country code
+        national = digits[1:] if len(digits) == 11 and digits.startswith('0') else digits
+        if len(national) == 10:
+            if not default_country_code:
+                return digits
+            digits = default_country_code + national
+        elif not (default_country_code and digits.startswith(default_country_code)
+                  and len(digits) == len(default_country_code) + 10):
+            return ''
+    return '+' + digits if 8 <= len(digits) <= 15 else ''
+
+
+def _normalize_email(match):
+    return match.group()
+
+
+def _normalize_linkedin(match):
+    return 'https://www.linkedin.com/' + match.group(1)
+
+
+def _normalize_github(match):
+    return 'https://github.com/' + match.group(1)
+
+
+def first_match(pattern, text, normalize, header_chars=HEADER_CHARS):
+    """First non-empty normalize(match), header region first"""
+    # The header ends on a line break: no value spans lines, so none is cut
+    # in two (the engine treats endpos as the end of the string)
+    header_end = text.find('\n', header_chars)
+    if header_end == -1:
+        header_end = len(text)
+    for match in pattern.finditer(text, 0, header_end):
+        value = normalize(match)
+        if value:
+            return value
+    for match in pattern.finditer(text, header_end):
+        value = normalize(match)
+        if value:
+            return value
+    return ''
+
+
+def extract_contact(text, header_chars=HEADER_CHARS, default_country_code=DEFAULT_COUNTRY_CODE):
+    """Return {'email', 'phone', 'linkedin', 'github'} ('' when not found)"""
+    return {
+        'email': first_match(EMAIL_RE, text, _normalize_email, header_chars),
+        'phone': first_match(PHONE_RE, text, lambda match: normalize_phone(match.group(), default_country_code),
+                             header_chars),
+        'linkedin': first_match(LINKEDIN_RE, text, _normalize_linkedin, header_chars),
+        'github': first_match(GITHUB_RE, text, _normalize_github, header_chars),
+    }
@@ -0,0 +1,521 @@
+"""Persistence layer for analysis results.
+
+A small connection pool, one-time schema setup and a background writer that
+batches result inserts into single commits. Results live in typed
+analysis_results rows with their skills and courses in association tables;
+migrate.py converts the old string-typed user_data table. MySQL is the default
+backend; SRA_DB_BACKEND=sqlite runs against a local file instead (handy for
+tests and load runs without a server).
+"""
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from instrumentation import timer
+
+DB_BACKEND = os.environ.get('SRA_DB_BACKEND', 'mysql')
+DB_HOST = os.environ.get('SRA_DB_HOST', 'localhost')
+DB_USER = os.environ.get('SRA_DB_USER', 'root')
+DB_PASSWORD = os.environ.get('SRA_DB_PASSWORD', '')
+DB_NAME = os.environ.get('SRA_DB_NAME', 'resume_classifier')
+SQLITE_PATH = os.environ.get('SRA_SQLITE_PATH', 'sra.db')
+POOL_SIZE = int(os.environ.get('SRA_DB_POOL_SIZE', 5))
+
+RESULT_COLUMNS = ['Name', 'Email_ID', 'resume_score', 'Page_no', 'created_at', 'Predicted_Field', 'User_level',
+                  'legacy_id', 'fingerprint', 'analyzer_version', 'analysis_json']
+
+# Columns recomputed when a stored resume is re-analyzed under new rules
+DERIVED_COLUMNS = ['Name', 'Email_ID', 'resume_score', 'Page_no', 'Predicted_Field', 'User_level',
+                   'analyzer_version', 'analysis_json']
+
+# Skills are stored one per row so "top skills per field" is an indexed
+# GROUP BY; kind is 'actual' or 'recommended'.
+SCHEMA = {
+    'mysql': ["""CREATE TABLE IF NOT EXISTS analysis_results
+                (ID INT NOT NULL AUTO_INCREMENT,
+                 Name VARCHAR(100) NOT NULL,
+                 Email_ID VARCHAR(100) NOT NULL,
+                 resume_score SMALLINT NOT NULL,
+                 Page_no SMALLINT NOT NULL,
+                 created_at DATETIME NULL,
+                 Predicted_Field VARCHAR(25) NOT NULL,
+                 User_level VARCHAR(30) NOT NULL,
+                 legacy_id INT NULL,
+                 fingerprint CHAR(64) NULL,
+                 analyzer_version VARCHAR(16) NULL,
+                 analysis_json MEDIUMTEXT NULL,
+                 PRIMARY KEY (ID),
+                 INDEX idx_results_field (Predicted_Field),
+                 INDEX idx_results_level (User_level),
+                 INDEX idx_results_created (created_at),
+                 UNIQUE INDEX idx_results_legacy (legacy_id),
+                 UNIQUE INDEX idx_results_fingerprint (fingerprint));
+              """,
+              """CREATE TABLE IF NOT EXISTS resume_documents
+                (content_hash CHAR(64) NOT NULL,
+                 no_of_pages SMALLINT NOT NULL,
+                 pages_json MEDIUMTEXT NOT NULL,
+                 PRIMARY KEY (content_hash));
+              """,
+              """CREATE TABLE IF NOT EXISTS result_skills
+                (result_id INT NOT NULL,
+                 kind VARCHAR(12) NOT NULL,
+                 skill VARCHAR(100) NOT NULL,
+                 position SMALLINT NOT NULL DEFAULT 0,
+                 PRIMARY KEY (result_id, kind, skill),
+                 INDEX idx_skills_kind_skill (kind, skill));
+              """,
+              """CREATE TABLE IF NOT EXISTS result_courses
+                (result_id INT NOT NULL,
+                 position SMALLINT NOT NULL,
+                 course VARCHAR(200) NOT NULL,
+                 PRIMARY KEY (result_id, position));
+              """],
+    'sqlite': ["""CREATE TABLE IF NOT EXISTS analysis_results
+                (ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                 Name VARCHAR(100) NOT NULL,
+                 Email_ID VARCHAR(100) NOT NULL,
+                 resume_score SMALLINT NOT NULL,
+                 Page_no SMALLINT NOT NULL,
+                 created_at DATETIME NULL,
+                 Predicted_Field VARCHAR(25) NOT NULL,
+                 User_level VARCHAR(30) NOT NULL,
+                 legacy_id INTEGER NULL UNIQUE,
+                 fingerprint CHAR(64) NULL UNIQUE,
+                 analyzer_version VARCHAR(16) NULL,
+                 analysis_json TEXT NULL);
+               """,
+               """CREATE TABLE IF NOT EXISTS resume_documents
+                (content_hash CHAR(64) NOT NULL PRIMARY KEY,
+                 no_of_pages SMALLINT NOT NULL,
+                 pages_json TEXT NOT NULL);
+               """,
+               "CREATE INDEX IF NOT EXISTS idx_results_field ON analysis_results (Predicted_Field)",
+               "CREATE INDEX IF NOT EXISTS idx_results_level ON analysis_results (User_level)",
+               "CREATE INDEX IF NOT EXISTS idx_results_created ON analysis_results (created_at)",
+               """CREATE TABLE IF NOT EXISTS result_skills
+                (result_id INTEGER NOT NULL,
+                 kind VARCHAR(12) NOT NULL,
+                 skill VARCHAR(100) NOT NULL,
+                 position SMALLINT NOT NULL DEFAULT 0,
+                 PRIMARY KEY (result_id, kind, skill));
+               """,
+               "CREATE INDEX IF NOT EXISTS idx_skills_kind_skill ON result_skills (kind, skill)",
+               """CREATE TABLE IF NOT EXISTS result_courses
+                (result_id INTEGER NOT NULL,
+                 position SMALLINT NOT NULL,
+                 course VARCHAR(200) NOT NULL,
+                 PRIMARY KEY (result_id, position));
+               """],
+}
+
+# Columns added after their table was first created, as (table, column,
+# definition); init_schema() adds the ones an existing database lacks
+ADDED_COLUMNS = [
+    # Skills keep the order the analysis listed them in
+    ('result_skills', 'position', 'SMALLINT NOT NULL DEFAULT 0'),
+]
+
+# Columns the admin dashboard is allowed to group on
+GROUPABLE_COLUMNS = ['Predicted_Field', 'User_level', 'resume_score', 'Page_no']
+
+WEEK_EXPR = {
+    'mysql': "DATE_FORMAT(created_at, '%%x-W%%v')",
+    'sqlite': "strftime('%Y-W%W', created_at)",
+}
+
+
+def _document(content_hash, no_of_pages, pages_json):
+    pages = json.loads(pages_json)
+    return {
+        'hash': content_hash,
+        'text': "".join(page + "\n" for page in pages),
+        'pages': pages,
+        'no_of_pages': no_of_pages,
+        'truncated': False,
+    }
+
+
+class ConnectionPool:
+    """Hand out at most ``size`` connections, one session at a time each"""
+
+    def __init__(self, connect, size=POOL_SIZE, check=None):
+        self._connect = connect
+        self._check = check
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._all = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+            try:
+                yield conn
+            except BaseException:
+                self._recycle(conn)
+                raise
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def _checkout(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+        if conn is not None and self._check:
+            try:
+                self._check(conn)
+            except Exception:
+                self._discard(conn)
+                conn = None
+        if conn is None:
+            conn = self._connect()
+            with self._lock:
+                self._all.append(conn)
+        return conn
+
+    def _recycle(self, conn):
+        """Put a connection back after a failed block, or drop it if it's broken"""
+        try:
+            conn.rollback()
+        except Exception:
+            self._discard(conn)
+        else:
+            self._idle.put(conn)
+
+    def _discard(self, conn):
+        with self._lock:
+            if conn in self._all:
+                self._all.remove(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._all:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._all = []
+
+
+class Database:
+    def __init__(self, backend=DB_BACKEND, pool_size=POOL_SIZE, sqlite_path=SQLITE_PATH):
+        self.backend = backend
+        self.sqlite_path = sqlite_path
+        self.writer = None
+        if backend == 'sqlite':
+            self.pool = ConnectionPool(self._connect_sqlite, pool_size)
+        elif backend == 'mysql':
+            self.pool = ConnectionPool(self._connect_mysql, pool_size,
+                                       check=lambda conn: conn.ping(reconnect=True))
+        else:
+            raise ValueError(f"Unknown database backend: {backend}")
+
+    def _connect_sqlite(self):
+        return sqlite3.connect(self.sqlite_path, check_same_thread=False)
+
+    def _connect_mysql(self, database=DB_NAME):
+        import pymysql
+        return pymysql.connect(host=DB_HOST, user=DB_USER, password=DB_PASSWORD, database=database)
+
+    def sql(self, statement):
+        """Queries are written with %s placeholders, sqlite3 wants ?"""
+        return statement.replace('%s', '?') if self.backend == 'sqlite' else statement
+
+    def insert_ignore(self):
+        return "INSERT OR IGNORE" if self.backend == 'sqlite' else "INSERT IGNORE"
+
+    def init_schema(self):
+        if self.backend == 'mysql':
+            conn = self._connect_mysql(database=None)
+            try:
+                conn.cursor().execute("CREATE DATABASE IF NOT EXISTS " + DB_NAME)
+            finally:
+                conn.close()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            for statement in SCHEMA[self.backend]:
+                cursor.execute(statement)
+            for table, column, definition in ADDED_COLUMNS:
+                if column not in self._columns(cursor, table):
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            conn.commit()
+
+    def _columns(self, cursor, table):
+        if self.backend == 'sqlite':
+            cursor.execute(f"PRAGMA table_info({table})")
+            return {row[1] for row in cursor.fetchall()}
+        cursor.execute(f"SHOW COLUMNS FROM {table}")
+        return {row[0] for row in cursor.fetchall()}
+
+    def fetchall(self, statement, params=()):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.sql(statement), params)
+            return cursor.fetchall()
+
+    def count_by(self, column):
+        """[(value, rows)] for a grouped column, aggregated by the database"""
+        if column not in GROUPABLE_COLUMNS:
+            raise ValueError(f"Unknown analysis_results column: {column}")
+        return self.fetchall(f"SELECT {column}, COUNT(*) FROM analysis_results GROUP BY {column} "
+                             f"ORDER BY COUNT(*) DESC")
+
+    def count_results(self):
+        return self.fetchall("SELECT COUNT(*) FROM analysis_results")[0][0]
+
+    def top_skills(self, field=None, limit=10):
+        """[(skill, candidates)] most common actual skills, optionally for one field"""
+        statement = "SELECT s.skill, COUNT(*) FROM result_skills s"
+        params = []
+        if field:
+            statement += " JOIN analysis_results r ON r.ID = s.result_id WHERE s.kind = 'actual' " \
+                         "AND r.Predicted_Field = %s"
+            params.append(field)
+        else:
+            statement += " WHERE s.kind = 'actual'"
+        statement += " GROUP BY s.skill ORDER BY COUNT(*) DESC LIMIT %s"
+        params.append(limit)
+        return self.fetchall(statement, params)
+
+    def score_by_week(self):
+        """[(week, resumes, average score)] in week order"""
+        week = WEEK_EXPR[self.backend]
+        return self.fetchall(f"SELECT {week} AS week, COUNT(*), AVG(resume_score) FROM analysis_results "
+                             f"WHERE created_at IS NOT NULL GROUP BY week ORDER BY week")
+
+    def fetch_results(self, after_id=0, limit=50):
+        """One page of results with ID > after_id (keyset pagination).
+
+        Each row is (ID, Name, Email, score, created_at, pages, field, level,
+        skills, recommended skills, courses) with the last three as lists.
+        """
+        rows = self.fetchall("SELECT ID, Name, Email_ID, resume_score, created_at, Page_no, Predicted_Field, "
+                             "User_level FROM analysis_results WHERE ID > %s ORDER BY ID LIMIT %s",
+                             (after_id, limit))
+        if not rows:
+            return []
+        ids = [row[0] for row in rows]
+        marks = ", ".join(["%s"] * len(ids))
+        skills = {(result_id, 'actual'): [] for result_id in ids}
+        skills.update({(result_id, 'recommended'): [] for result_id in ids})
+        for result_id, kind, skill in self.fetchall(
+                f"SELECT result_id, kind, skill FROM result_skills WHERE result_id IN ({marks}) "
+                f"ORDER BY result_id, kind, position", ids):
+            skills[(result_id, kind)].append(skill)
+        courses = {result_id: [] for result_id in ids}
+        for result_id, course in self.fetchall(
+                f"SELECT result_id, course FROM result_courses WHERE result_id IN ({marks}) "
+                f"ORDER BY result_id, position", ids):
+            courses[result_id].append(course)
+        return [tuple(row) + (skills[(row[0], 'actual')], skills[(row[0], 'recommended')], courses[row[0]])
+                for row in rows]
+
+    def iter_results(self, chunk_size=1000):
+        """Stream every result in ID order without holding the table in memory"""
+        after_id = 0
+        while True:
+            rows = self.fetch_results(after_id, chunk_size)
+            if not rows:
+                return
+            yield from rows
+            after_id = rows[-1][0]
+
+    def find_analysis(self, fingerprint):
+        """The stored analysis dict for a resume fingerprint, or None"""
+        rows = self.fetchall("SELECT analysis_json FROM analysis_results WHERE fingerprint = %s", (fingerprint,))
+        if not rows or not rows[0][0]:
+            return None
+        return json.loads(rows[0][0])
+
+    def load_document(self, content_hash):
+        """The extracted text saved for a resume, in ingest_pdf()'s format"""
+        rows = self.fetchall("SELECT no_of_pages, pages_json FROM resume_documents WHERE content_hash = %s",
+                             (content_hash,))
+        if not rows:
+            return None
+        return _document(content_hash, rows[0][0], rows[0][1])
+
+    def iter_documents(self, chunk_size=200):
+        """Stream every saved document in content_hash order"""
+        after = ''
+        while True:
+            rows = self.fetchall("SELECT content_hash, no_of_pages, pages_json FROM resume_documents "
+                                 "WHERE content_hash > %s ORDER BY content_hash LIMIT %s", (after, chunk_size))
+            if not rows:
+                return
+            for row in rows:
+                yield _document(*row)
+            after = rows[-1][0]
+
+    def insert_results(self, results):
+        """Insert many analysis results (dicts) in one transaction.
+
+        Keys: name, email, resume_score, no_of_pages, created_at (datetime),
+        predicted_field, user_level, skills, recommended_skills, courses and
+        optionally legacy_id, fingerprint, analyzer_version, analysis (dict)
+        and document (the ingest_pdf() output to keep for re-analysis).
+
+        A result whose fingerprint is already stored is not duplicated: if it
+        was produced by another analyzer version its derived columns and
+        skills are updated in place, otherwise it is skipped. Courses are only
+        replaced when the result has any.
+        """
+        statement = self.sql(self.insert_ignore() + " INTO analysis_results (" + ", ".join(RESULT_COLUMNS) +
+                             ") VALUES (" + ", ".join(["%s"] * len(RESULT_COLUMNS)) + ")")
+        update = self.sql("UPDATE analysis_results SET " + ", ".join(f"{column} = %s" for column in DERIVED_COLUMNS) +
+                          " WHERE fingerprint = %s AND analyzer_version <> %s")
+        document_statement = self.sql(self.insert_ignore() + " INTO resume_documents "
+                                      "(content_hash, no_of_pages, pages_json) VALUES (%s, %s, %s)")
+        skill_rows = []
+        course_rows = []
+        with timer('db_insert', rows=len(results)), self.pool.connection() as conn:
+            cursor = conn.cursor()
+            for result in results:
+                document = result.get('document')
+                if document:
+                    cursor.execute(document_statement, (document['hash'], document['no_of_pages'],
+                                                        json.dumps(document['pages'])))
+                created_at = result.get('created_at')
+                analysis = result.get('analysis')
+                derived = {
+                    'Name': result['name'][:100],
+                    'Email_ID': result['email'][:100],
+                    'resume_score': int(result['resume_score']),
+                    'Page_no': int(result['no_of_pages']),
+                    'Predicted_Field': result['predicted_field'],
+                    'User_level': result['user_level'],
+                    'analyzer_version': result.get('analyzer_version'),
+                    'analysis_json': json.dumps(analysis) if analysis is not None else None,
+                }
+                row = dict(derived, created_at=created_at.strftime('%Y-%m-%d %H:%M:%S') if created_at else None,
+                           legacy_id=result.get('legacy_id'), fingerprint=result.get('fingerprint'))
+                cursor.execute(statement, [row[column] for column in RESULT_COLUMNS])
+                if cursor.rowcount == 1:
+                    result_id = cursor.lastrowid
+                else:
+                    # Already stored: refresh it only if the analyzer changed since
+                    cursor.execute(update, [derived[column] for column in DERIVED_COLUMNS] +
+                                   [result.get('fingerprint'), result.get('analyzer_version')])
+                    if cursor.rowcount == 0:
+                        continue
+                    cursor.execute(self.sql("SELECT ID FROM analysis_results WHERE fingerprint = %s"),
+                                   (result.get('fingerprint'),))
+                    result_id = cursor.fetchone()[0]
+                    cursor.execute(self.sql("DELETE FROM result_skills WHERE result_id = %s"), (result_id,))
+                    if result['courses']:
+                        cursor.execute(self.sql("DELETE FROM result_courses WHERE result_id = %s"), (result_id,))
+                for kind, key in (('actual', 'skills'), ('recommended', 'recommended_skills')):
+                    # dict.fromkeys drops repeats while keeping order
+                    for position, skill in enumerate(dict.fromkeys(skill[:100] for skill in result[key])):
+                        skill_rows.append((result_id, kind, skill, position))
+                for position, course in enumerate(result['courses']):
+                    course_rows.append((result_id, position, course[:200]))
+            if skill_rows:
+                cursor.executemany(self.sql("INSERT INTO result_skills (result_id, kind, skill, position) "
+                                            "VALUES (%s, %s, %s, %s)"), skill_rows)
+            if course_rows:
+                cursor.executemany(self.sql("INSERT INTO result_courses (result_id, position, course) "
+                                            "VALUES (%s, %s, %s)"), course_rows)
+            conn.commit()
+
+    def start_writer(self, **options):
+        self.writer = BatchWriter(self.insert_results, **options)
+        return self.writer
+
+    def close(self):
+        # Flush queued rows before the connections go away
+        if self.writer:
+            self.writer.close()
+        self.pool.close_all()
+
+
+class BatchWriter:
+    """Queue rows and write them from a background thread.
+
+    Rows are grouped into one write() call (one commit) of up to ``batch_size``
+    rows, or whatever arrived within ``interval`` seconds. close() (also run
+    at interpreter exit) flushes everything still queued.
+    """
+
+    def __init__(self, write, batch_size=50, interval=0.5):
+        self._write = write
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='sra-db-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, row):
+        if self._closed:
+            raise RuntimeError("BatchWriter is closed")
+        self._queue.put(row)
+
+    def flush(self):
+        """Block until every row submitted so far is written"""
+        self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = []
+            row = self._queue.get()
+            while True:
+                if row is None:
+                    stop = True
+                else:
+                    batch.append(row)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    row = self._queue.get(timeout=self.interval)
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    print(f"Database error: {e}")
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+
+
+_database = None
+_database_lock = threading.Lock()
+
+
+def get_database():
+    """Process-wide Database with its schema set up and a writer attached.
+
+    Raises if the database can't be reached.
+    """
+    global _database
+    with _database_lock:
+        if _database is None:
+            database = Database()
+            database.init_schema()
+            database.start_writer()
+            atexit.register(database.close)
+            _database = database
+        return _database
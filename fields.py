@@ -0,0 +1,119 @@
+from courses import ds_course, web_course, android_course, ios_course, uiux_course
+
+# One row per career field: the skills that point to it (with weights), the
+# skills we recommend adding and the course list to draw from. Skills shared
+# between fields carry a lower weight so they don't decide the field alone.
+FIELDS = [
+    {
+        'name': 'Data Science',
+        'job_title': 'Data Science',
+        'keywords': {
+            'tensorflow': 1.0, 'keras': 1.0, 'pytorch': 1.0, 'machine learning': 1.0, 'deep learning': 1.0,
+            'flask': 0.5, 'streamlit': 1.0,
+        },
+        'recommended_skills': ['Data Visualization', 'Predictive Analysis', 'Statistical Modeling', 'Data Mining',
+                               'Clustering & Classification', 'Data Analytics', 'Quantitative Analysis',
+                               'Web Scraping', 'ML Algorithms', 'Keras', 'Pytorch', 'Probability', 'Scikit-learn',
+                               'Tensorflow', 'Flask', 'Streamlit'],
+        'courses': ds_course,
+    },
+    {
+        'name': 'Web Development',
+        'job_title': 'Web Development',
+        'keywords': {
+            'react': 1.0, 'django': 1.0, 'node js': 1.0, 'react js': 1.0, 'php': 1.0, 'laravel': 1.0,
+            'magento': 1.0, 'wordpress': 1.0, 'javascript': 1.0, 'angular js': 1.0, 'c#': 1.0, 'flask': 0.5,
+        },
+        'recommended_skills': ['React', 'Django', 'Node JS', 'React JS', 'php', 'laravel', 'Magento', 'wordpress',
+                               'Javascript', 'Angular JS', 'c#', 'Flask', 'SDK'],
+        'courses': web_course,
+    },
+    {
+        'name': 'Android Development',
+        'job_title': 'Android App Development',
+        'keywords': {
+            'android': 1.0, 'android development': 1.0, 'flutter': 1.0, 'kotlin': 1.0, 'xml': 1.0, 'kivy': 1.0,
+        },
+        'recommended_skills': ['Android', 'Android development', 'Flutter', 'Kotlin', 'XML', 'Java', 'Kivy', 'GIT',
+                               'SDK', 'SQLite'],
+        'courses': android_course,
+    },
+    {
+        'name': 'IOS Development',
+        'job_title': 'IOS App Development',
+        'keywords': {
+            'ios': 1.0, 'ios development': 1.0, 'swift': 1.0, 'cocoa': 1.0, 'cocoa touch': 1.0, 'xcode': 1.0,
+        },
+        'recommended_skills': ['IOS', 'IOS Development', 'Swift', 'Cocoa', 'Cocoa Touch', 'Xcode', 'Objective-C',
+                               'SQLite', 'Plist', 'StoreKit', 'UI-Kit', 'AV Foundation', 'Auto-Layout'],
+        'courses': ios_course,
+    },
+    {
+        'name': 'UI-UX Development',
+        'job_title': 'UI-UX Development',
+        'keywords': {
+            'ux': 1.0, 'adobe xd': 1.0, 'figma': 1.0, 'zeplin': 1.0, 'balsamiq': 1.0, 'ui': 1.0,
+            'prototyping': 1.0, 'wireframes': 1.0, 'storyframes': 1.0, 'adobe photoshop': 1.0, 'photoshop': 1.0,
+            'editing': 1.0, 'adobe illustrator': 1.0, 'illustrator': 1.0, 'adobe after effects': 1.0,
+            'after effects': 1.0, 'adobe premier pro': 1.0, 'premier pro': 1.0, 'adobe indesign': 1.0,
+            'indesign': 1.0, 'wireframe': 1.0, 'solid': 1.0, 'grasp': 1.0, 'user research': 1.0,
+            'user experience': 1.0,
+        },
+        'recommended_skills': ['UI', 'User Experience', 'Adobe XD', 'Figma', 'Zeplin', 'Balsamiq', 'Prototyping',
+                               'Wireframes', 'Storyframes', 'Adobe Photoshop', 'Editing', 'Illustrator',
+                               'After Effects', 'Premier Pro', 'Indesign', 'Wireframe', 'Solid', 'Grasp',
+                               'User Research'],
+        'courses': uiux_course,
+    },
+]
+
+FIELDS_BY_NAME = {field['name']: field for field in FIELDS}
+
+# Keywords that are also everyday English ("a solid grasp of", "strong
+# editing skills"). They still score when passed in as skills, but the skill
+# extractor doesn't look for them in resume text.
+GENERIC_KEYWORDS = {'solid', 'grasp', 'editing'}
+
+
+def _build_index(fields):
+    """Map each lowercase skill to [(field position, weight), ...]"""
+    index = {}
+    for position, field in enumerate(fields):
+        for skill, weight in field['keywords'].items():
+            index.setdefault(skill.lower(), []).append((position, weight))
+    return index
+
+
+SKILL_INDEX = _build_index(FIELDS)
+
+
+def classify_fields(skills):
+    """Rank the fields matched by ``skills``.
+
+    ``skills`` is either a list of skill names or a {skill: hit count} mapping
+    (e.g. extract_resume_data()['skill_hits']), in which case each skill's
+    weight is multiplied by its count. Returns a list of
+    (field name, score, confidence) sorted best first; confidence is the share
+    of the total score. Ties keep the FIELDS order, so the ranking never
+    depends on the order the skills were found in.
+    """
+    if isinstance(skills, dict):
+        counts = {skill: hit['count'] if isinstance(hit, dict) else hit for skill, hit in skills.items()}
+    else:
+        counts = dict.fromkeys(skills, 1)
+
+    scores = [0.0] * len(FIELDS)
+    for skill, count in counts.items():
+        for position, weight in SKILL_INDEX.get(skill.lower(), ()):
+            scores[position] += weight * count
+
+    total = sum(scores)
+    ranked = sorted((position for position, score in enumerate(scores) if score > 0),
+                    key=lambda position: -scores[position])
+    return [(FIELDS[position]['name'], scores[position], scores[position] / total) for position in ranked]
+
+
+def predict_field(skills):
+    """Return the best matching field row from FIELDS, or None"""
+    ranking = classify_fields(skills)
+    return FIELDS_BY_NAME[ranking[0][0]] if ranking else None
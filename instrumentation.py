@@ -0,0 +1,156 @@
+"""Lightweight per-stage timing.
+
+Wrap a pipeline stage in ``with timer('stage'):`` and every configured sink
+receives its duration. With no sinks configured a timer costs two
+perf_counter() calls. Sinks are set with add_sink() or from SRA_METRICS, a
+comma separated list of ``log``, ``json:<path>`` and ``prom:<path>``.
+
+A worker process that shouldn't write the sinks itself (limits.py) records
+into a RecordingSink instead, and its parent feeds the events to replay().
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class LogSink:
+    def record(self, stage, seconds, labels):
+        extra = ''.join(f" {key}={value}" for key, value in labels.items())
+        print(f"[timing] {stage} {seconds * 1000:.2f}ms{extra}")
+
+
+class JSONLinesSink:
+    """Append one JSON object per timed stage"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, labels):
+        line = json.dumps({'ts': time.time(), 'stage': stage, 'seconds': seconds, **labels})
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+class PrometheusTextSink:
+    """Keep count/sum per stage and rewrite a node_exporter textfile.
+
+    The file is rewritten at most every ``interval`` seconds (and on flush()).
+    """
+
+    def __init__(self, path, interval=5.0):
+        self.path = path
+        self.interval = interval
+        self._totals = {}
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, labels):
+        with self._lock:
+            count, total = self._totals.get(stage, (0, 0.0))
+            self._totals[stage] = (count + 1, total + seconds)
+            if time.monotonic() - self._last_write >= self.interval:
+                self._write()
+
+    def flush(self):
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        lines = ['# HELP sra_stage_seconds Time spent in each resume analysis stage',
+                 '# TYPE sra_stage_seconds summary']
+        for stage, (count, total) in sorted(self._totals.items()):
+            lines.append(f'sra_stage_seconds_count{{stage="{stage}"}} {count}')
+            lines.append(f'sra_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.path)
+        self._last_write = time.monotonic()
+
+
+class MemorySink:
+    """Collect durations in memory, {stage: [seconds, ...]} (for benchmarks)"""
+
+    def __init__(self):
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, labels):
+        with self._lock:
+            self.timings.setdefault(stage, []).append(seconds)
+
+
+class RecordingSink:
+    """Keep (stage, seconds, labels) for replay() in another process"""
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, labels):
+        with self._lock:
+            self.events.append((stage, seconds, labels))
+
+
+_sinks = []
+
+
+def add_sink(sink):
+    _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def set_sinks(sinks):
+    """Replace every configured sink"""
+    _sinks[:] = sinks
+
+
+def sinks_from_env(spec):
+    sinks = []
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        kind, _, path = item.partition(':')
+        if kind == 'log':
+            sinks.append(LogSink())
+        elif kind == 'json' and path:
+            sinks.append(JSONLinesSink(path))
+        elif kind == 'prom' and path:
+            sinks.append(PrometheusTextSink(path))
+        else:
+            print(f"Ignoring unknown metrics sink: {item}")
+    return sinks
+
+
+def _emit(stage, seconds, labels):
+    for sink in list(_sinks):
+        try:
+            sink.record(stage, seconds, labels)
+        except Exception as e:
+            print(f"Metrics sink error: {e}")
+
+
+@contextmanager
+def timer(stage, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _sinks:
+            _emit(stage, time.perf_counter() - start, labels)
+
+
+def replay(events):
+    """Send events collected by a RecordingSink to this process's sinks"""
+    for stage, seconds, labels in events:
+        _emit(stage, seconds, labels)
+
+
+for _sink in sinks_from_env(os.environ.get('SRA_METRICS', '')):
+    add_sink(_sink)
@@ -0,0 +1,168 @@
+"""Per-session resource limits for the Streamlit app.
+
+One server process serves every session, so a single heavy upload must not
+starve the others:
+
+- uploads over SRA_MAX_UPLOAD_MB are rejected before parsing. Streamlit
+  enforces server.maxUploadSize (.streamlit/config.toml) in the uploader
+  itself, keep the two in step;
+- at most SRA_MAX_CONCURRENT_ANALYSES analyses run at once, each in a
+  process of its own so parsing doesn't hold the server's GIL. A session that
+  can't get a slot within SRA_ANALYSIS_QUEUE_TIMEOUT seconds is told to try
+  again;
+- an analysis still running after SRA_ANALYSIS_TIMEOUT seconds is killed,
+  which frees its slot straight away. OCR inside an analysis gets at most
+  3/4 of that time, so a slow scan comes back with partial text, and
+  cpu_count / SRA_MAX_CONCURRENT_ANALYSES processes. The upload preview is
+  rendered the same way, within SRA_PREVIEW_TIMEOUT seconds.
+
+Timings recorded in an analysis process come back with its result and are
+replayed into this process's metrics sinks, so a single set of counters
+covers every analysis. Each process starts with empty memory caches, so
+repeat uploads are served by the parse and OCR caches on disk
+(SRA_INGEST_CACHE_DIR and SRA_OCR_CACHE_DIR, on by default).
+"""
+import multiprocessing
+import os
+import signal
+import threading
+
+import instrumentation
+
+MAX_UPLOAD_MB = float(os.environ.get('SRA_MAX_UPLOAD_MB', 10))
+MAX_CONCURRENT_ANALYSES = int(os.environ.get('SRA_MAX_CONCURRENT_ANALYSES', os.cpu_count() or 1))
+QUEUE_TIMEOUT = float(os.environ.get('SRA_ANALYSIS_QUEUE_TIMEOUT', 10))
+ANALYSIS_TIMEOUT = float(os.environ.get('SRA_ANALYSIS_TIMEOUT', 60))
+PREVIEW_TIMEOUT = float(os.environ.get('SRA_PREVIEW_TIMEOUT', 10))
+# Seconds a stopped analysis gets to shut its OCR pool down before it is killed
+STOP_GRACE = 2.0
+# OCR gets at most this share of the analysis timeout, so a slow scan comes
+# back with partial text instead of being killed whole
+OCR_TIMEOUT_SHARE = 0.75
+
+
+class LimitExceeded(Exception):
+    """A request went over one of the limits, the message is shown to the user"""
+
+
+class UploadTooLarge(LimitExceeded):
+    pass
+
+
+class AnalyzerBusy(LimitExceeded):
+    pass
+
+
+class AnalysisTimeout(LimitExceeded):
+    pass
+
+
+class AnalysisFailed(Exception):
+    """The analysis process died without a result (crash, out of memory)"""
+
+
+_slots = threading.BoundedSemaphore(MAX_CONCURRENT_ANALYSES)
+# Forked from a single-threaded server that has the analyzer imported, where
+# available: cheap to start, and nothing inherited from the Streamlit server's
+# threads or pdfium. Spawned elsewhere.
+if 'forkserver' in multiprocessing.get_all_start_methods():
+    _context = multiprocessing.get_context('forkserver')
+    _context.set_forkserver_preload(['analyzer'])
+else:
+    _context = multiprocessing.get_context('spawn')
+
+
+def check_upload(data, max_mb=MAX_UPLOAD_MB):
+    if len(data) > max_mb * 1024 * 1024:
+        raise UploadTooLarge(f"The resume is {len(data) / 1024 / 1024:.1f} MB, the limit is {max_mb:g} MB.")
+
+
+def _stop(signum, frame):
+    raise SystemExit(1)
+
+
+def ocr_workers(concurrent):
+    """OCR processes per analysis, so ``concurrent`` analyses share the CPUs"""
+    return max(1, (os.cpu_count() or 1) // max(1, concurrent))
+
+
+def _analysis_process(conn, func, args, ocr_workers, ocr_budget):
+    """Child entry point, sends back (ok, result or exception, timing events)"""
+    import ocr
+
+    signal.signal(signal.SIGTERM, _stop)
+    # One analysis per process, so its scanned pages can fan out
+    ocr.allow_pool(ocr_workers, ocr_budget)
+    recorder = instrumentation.RecordingSink()
+    instrumentation.set_sinks([recorder])
+    try:
+        message = (True, func(*args))
+    except Exception as e:
+        message = (False, e)
+    try:
+        conn.send(message + (recorder.events,))
+    except Exception as e:
+        # The result or exception didn't pickle
+        conn.send((False, AnalysisFailed(f"{type(e).__name__}: {e}"), recorder.events))
+    conn.close()
+
+
+def run_in_process(func, *args, timeout=ANALYSIS_TIMEOUT, concurrent=1):
+    """func(*args) in a new process, killed after ``timeout`` seconds.
+
+    ``func`` and its arguments must be picklable, exceptions raised by it are
+    raised here. Raises AnalysisTimeout or AnalysisFailed when it doesn't
+    come back with a result. ``concurrent`` is how many of these may run at
+    once, OCR inside each gets an equal share of the CPUs.
+    """
+    receiver, sender = _context.Pipe(duplex=False)
+    process = _context.Process(target=_analysis_process,
+                               args=(sender, func, args, ocr_workers(concurrent), timeout * OCR_TIMEOUT_SHARE))
+    finished = False
+    try:
+        try:
+            process.start()
+        except OSError as e:
+            # The child died while it was being handed func and args
+            raise AnalysisFailed("The analysis stopped unexpectedly, please try again.") from e
+        sender.close()
+        if not receiver.poll(timeout):
+            raise AnalysisTimeout(f"The analysis took longer than {timeout:g} seconds and was stopped.")
+        try:
+            ok, value, events = receiver.recv()
+        except EOFError:
+            raise AnalysisFailed("The analysis stopped unexpectedly, please try again.") from None
+        finished = True
+    finally:
+        receiver.close()
+        _reap(process, finished)
+    instrumentation.replay(events)
+    if not ok:
+        raise value
+    return value
+
+
+def run_limited(func, *args, queue_timeout=QUEUE_TIMEOUT, timeout=ANALYSIS_TIMEOUT):
+    """run_in_process() within the app's concurrency limit"""
+    if not _slots.acquire(timeout=queue_timeout):
+        raise AnalyzerBusy("The analyzer is busy right now, please try again in a moment.")
+    try:
+        return run_in_process(func, *args, timeout=timeout, concurrent=MAX_CONCURRENT_ANALYSES)
+    finally:
+        _slots.release()
+
+
+def _reap(process, finished):
+    """Join an analysis process, stopping it first unless it has sent its result"""
+    if process.pid is None:
+        return
+    if finished:
+        process.join(STOP_GRACE)
+    if process.is_alive():
+        # SIGTERM first so the analysis can kill its OCR pool
+        process.terminate()
+        process.join(STOP_GRACE)
+    if process.is_alive():
+        process.kill()
+        process.join()
+    process.close()
@@ -0,0 +1,379 @@
+"""Rank analyzed resumes against a job description.
+
+    python matcher.py sync                     # index documents saved in the database
+    python matcher.py query "Senior Android developer, Kotlin" [-k 10]
+    python matcher.py compact
+
+Every resume becomes one row of hashed features: its words plus its skills
+(as extra ``skill:<name>`` tokens), each bucketed with crc32 into
+N_FEATURES columns, weighted 1 + log(tf) and L2 normalized. Rows live in
+immutable CSR segments of .npy files under SRA_MATCH_INDEX_DIR, which are
+memory-mapped on load, so opening a 200k resume index costs little memory.
+
+New analyses are buffered and written as a new segment every
+SRA_MATCH_FLUSH_EVERY resumes (and at exit). Segments are grouped in tiers
+by size, each tier SRA_MATCH_MERGE_FACTOR times larger than the one below,
+and once a tier holds that many segments they are merged into one of the next
+tier. Merges run on a background thread and only take the lock to swap the
+new segment in, so a resume is rewritten about log(N) times in total and
+no request waits for a merge; ``compact`` merges everything into one. A query is
+featurized the same way, weighted by idf over the whole index, and scored
+with one sparse matrix product per segment. The index expects a single
+writer process.
+"""
+import argparse
+import atexit
+import heapq
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+import scipy.sparse as sp
+
+from skills import match_skills
+
+MATCH_INDEX_DIR = os.environ.get('SRA_MATCH_INDEX_DIR', './match_index')
+FLUSH_EVERY = int(os.environ.get('SRA_MATCH_FLUSH_EVERY', 100))
+MERGE_FACTOR = int(os.environ.get('SRA_MATCH_MERGE_FACTOR', 4))
+
+N_FEATURES = 2 ** 20
+# A skill found by the skill matcher counts as much as this many mentions
+SKILL_WEIGHT = 3
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+MANIFEST = 'manifest.json'
+
+
+def _bucket(token):
+    return zlib.crc32(token.encode('utf-8')) & (N_FEATURES - 1)
+
+
+def featurize(text, skills=None):
+    """Return (sorted int32 feature ids, float32 weights with unit L2 norm)"""
+    if skills is None:
+        skills = match_skills(text)
+    counts = {}
+    for token in TOKEN_RE.findall(text.lower()):
+        counts[token] = counts.get(token, 0) + 1
+    for skill in skills:
+        token = 'skill:' + skill.lower()
+        counts[token] = counts.get(token, 0) + SKILL_WEIGHT
+
+    buckets = {}
+    for token, count in counts.items():
+        bucket = _bucket(token)
+        buckets[bucket] = buckets.get(bucket, 0) + count
+    ids = np.fromiter(sorted(buckets), dtype=np.int32, count=len(buckets))
+    weights = 1 + np.log(np.fromiter((buckets[i] for i in ids.tolist()), dtype=np.float32, count=len(ids)))
+    norm = np.linalg.norm(weights)
+    if norm:
+        weights /= norm
+    return ids, weights
+
+
+def _to_csr(rows):
+    """Stack [(ids, weights), ...] into a CSR matrix with int32 indices"""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(ids) for ids, _ in rows], out=indptr[1:])
+    if indptr[-1] < 2 ** 31:
+        indptr = indptr.astype(np.int32)
+    indices = np.concatenate([ids for ids, _ in rows]) if rows else np.zeros(0, dtype=np.int32)
+    data = np.concatenate([weights for _, weights in rows]) if rows else np.zeros(0, dtype=np.float32)
+    return sp.csr_matrix((data, indices, indptr), shape=(len(rows), N_FEATURES))
+
+
+class Segment:
+    """One immutable block of rows, memory-mapped from its directory"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+
+        def load(name):
+            return np.load(os.path.join(path, name + '.npy'), mmap_mode='r')
+
+        self.fingerprints = load('fingerprints')
+        self.matrix = sp.csr_matrix((load('data'), load('indices'), load('indptr')),
+                                    shape=(len(self.fingerprints), N_FEATURES), copy=False)
+        self.df_ids = load('df_ids')
+        self.df_counts = load('df_counts')
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+    @staticmethod
+    def write(directory, name, fingerprints, matrix):
+        """Write a segment atomically and return it loaded"""
+        path = os.path.join(directory, name)
+        tmp_path = path + '.tmp'
+        os.makedirs(tmp_path, exist_ok=True)
+        df_ids, df_counts = np.unique(matrix.indices, return_counts=True)
+        arrays = {
+            'fingerprints': np.array(fingerprints, dtype='S64'),
+            'data': matrix.data.astype(np.float32, copy=False),
+            'indices': matrix.indices.astype(np.int32, copy=False),
+            'indptr': matrix.indptr,
+            'df_ids': df_ids.astype(np.int32),
+            'df_counts': df_counts.astype(np.int32),
+        }
+        for key, array in arrays.items():
+            np.save(os.path.join(tmp_path, key + '.npy'), array)
+        os.replace(tmp_path, path)
+        return Segment(path)
+
+
+class MatchIndex:
+    def __init__(self, path=MATCH_INDEX_DIR, flush_every=FLUSH_EVERY, merge_factor=MERGE_FACTOR):
+        self.path = path
+        self.flush_every = flush_every
+        self.merge_factor = max(2, merge_factor)
+        self.segments = []
+        self._pending = []
+        self._known = set()
+        self._df = np.zeros(N_FEATURES, dtype=np.int64)
+        self._lock = threading.Lock()
+        # Held for a whole merge (taken before _lock), one merge at a time
+        self._merge_lock = threading.Lock()
+        self._merger = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.path, MANIFEST), encoding='utf-8') as f:
+                names = json.load(f)['segments']
+        except FileNotFoundError:
+            return
+        for name in names:
+            segment = Segment(os.path.join(self.path, name))
+            self.segments.append(segment)
+            self._known.update(fingerprint.decode() for fingerprint in segment.fingerprints)
+            # Feature ids are unique within a segment
+            self._df[segment.df_ids] += segment.df_counts
+
+    def _write_manifest(self):
+        os.makedirs(self.path, exist_ok=True)
+        path = os.path.join(self.path, MANIFEST)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'n_features': N_FEATURES, 'segments': [segment.name for segment in self.segments]}, f)
+        os.replace(path + '.tmp', path)
+
+    def __len__(self):
+        return sum(len(segment) for segment in self.segments) + len(self._pending)
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self._known
+
+    def add(self, fingerprint, text, skills=None):
+        """Index one resume, returns False if its fingerprint is already indexed"""
+        ids, weights = featurize(text, skills)
+        with self._lock:
+            if fingerprint in self._known:
+                return False
+            self._known.add(fingerprint)
+            self._pending.append((fingerprint, ids, weights))
+            self._df[ids] += 1
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+        return True
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """Flush pending rows and wait for a running merge"""
+        self.flush()
+        merger = self._merger
+        if merger is not None:
+            merger.join()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        rows = self._pending
+        name = f'seg-{time.time_ns():020d}-{os.getpid()}'
+        matrix = _to_csr([(ids, weights) for _, ids, weights in rows])
+        segment = Segment.write(self.path, name, [fingerprint for fingerprint, _, _ in rows], matrix)
+        self.segments.append(segment)
+        self._pending = []
+        self._write_manifest()
+        if self._merger is None and self._full_tier():
+            self._merger = threading.Thread(target=self._merge_tiers, name='match-index-merge')
+            self._merger.start()
+
+    def _tier(self, rows):
+        tier, size = 0, self.flush_every
+        while rows > size:
+            tier += 1
+            size *= self.merge_factor
+        return tier
+
+    def _full_tier(self):
+        """The oldest merge_factor segments of the smallest full tier, or None"""
+        tiers = {}
+        for segment in self.segments:
+            tiers.setdefault(self._tier(len(segment)), []).append(segment)
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= self.merge_factor:
+                return tiers[tier][:self.merge_factor]
+        return None
+
+    def _merge_tiers(self):
+        try:
+            while True:
+                with self._merge_lock:
+                    with self._lock:
+                        run = self._full_tier()
+                        if run is None:
+                            self._merger = None
+                            return
+                    self._merge(run)
+        except Exception as e:
+            print(f"Error merging match index segments: {e}")
+            with self._lock:
+                self._merger = None
+
+    def compact(self):
+        """Merge every segment (and pending row) into one"""
+        with self._merge_lock:
+            with self._lock:
+                self._flush()
+                old = list(self.segments)
+            if len(old) > 1:
+                self._merge(old)
+
+    def _merge(self, old):
+        """Write ``old`` as one segment and swap it in, called with _merge_lock
+        held. Searches and adds carry on while it is written."""
+        fingerprints = np.concatenate([segment.fingerprints for segment in old])
+        matrix = sp.vstack([segment.matrix for segment in old], format='csr')
+        # vstack may widen indptr to int64, keep the files memory-map friendly
+        if matrix.nnz < 2 ** 31:
+            matrix.indptr = matrix.indptr.astype(np.int32)
+        merged = Segment.write(self.path, f'seg-{time.time_ns():020d}-{os.getpid()}',
+                               [fingerprint.decode() for fingerprint in fingerprints], matrix)
+        with self._lock:
+            self.segments = [segment for segment in self.segments if segment not in old] + [merged]
+            self._write_manifest()
+        for segment in old:
+            shutil.rmtree(segment.path, ignore_errors=True)
+
+    def _query_matrix(self, texts):
+        total = max(len(self), 1)
+        rows = []
+        for text in texts:
+            ids, weights = featurize(text)
+            # Smoothed idf, rare terms in the job description count for more
+            idf = np.log((1 + total) / (1 + self._df[ids])).astype(np.float32) + 1
+            rows.append((ids, weights * idf))
+        return _to_csr(rows)
+
+    def search_many(self, texts, k=10):
+        """Top ``k`` [(fingerprint, score), ...] for each text, best first"""
+        with self._lock:
+            segments = list(self.segments)
+            pending = list(self._pending)
+            queries = self._query_matrix(texts)
+        if len(texts) == 1:
+            # One query: a dense vector product is about twice as fast as a
+            # sparse-sparse one, which wins once several queries share a pass
+            queries = queries.toarray().T
+        else:
+            queries = queries.T.tocsr()
+        blocks = [(segment.matrix, segment.fingerprints) for segment in segments]
+        if pending:
+            blocks.append((_to_csr([(ids, weights) for _, ids, weights in pending]),
+                           np.array([fingerprint for fingerprint, _, _ in pending], dtype='S64')))
+
+        best = [[] for _ in texts]
+        for matrix, fingerprints in blocks:
+            if not matrix.shape[0]:
+                continue
+            scores = matrix @ queries
+            if sp.issparse(scores):
+                scores = scores.toarray()
+            for column, heap in enumerate(best):
+                column_scores = scores[:, column]
+                top = np.argpartition(-column_scores, k - 1)[:k] if len(column_scores) > k else \
+                    np.arange(len(column_scores))
+                for row in top:
+                    score = float(column_scores[row])
+                    if score > 0:
+                        heap.append((score, fingerprints[row].decode()))
+        return [[(fingerprint, score) for score, fingerprint in heapq.nlargest(k, heap)] for heap in best]
+
+    def search(self, text, k=10):
+        return self.search_many([text], k)[0]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_match_index():
+    """Process-wide MatchIndex, pending rows are flushed at exit"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = MatchIndex()
+            atexit.register(_index.close)
+        return _index
+
+
+def sync(index, database):
+    """Index every saved document that isn't in the index yet"""
+    added = 0
+    for doc in database.iter_documents():
+        if doc['hash'] not in index and index.add(doc['hash'], doc['text']):
+            added += 1
+            if added % 1000 == 0:
+                print(f"Indexed {added} resumes", file=sys.stderr)
+    index.flush()
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match job descriptions against analyzed resumes")
+    parser.add_argument('--index', default=MATCH_INDEX_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('sync', help="index documents saved in the database")
+    query = commands.add_parser('query', help="top candidates for a job description")
+    query.add_argument('text', help="job description, or @path to read it from a file")
+    query.add_argument('-k', type=int, default=10)
+    commands.add_parser('compact', help="merge all segments into one")
+    args = parser.parse_args(argv)
+
+    index = MatchIndex(args.index)
+    if args.command == 'sync':
+        from db import Database
+        database = Database()
+        database.init_schema()
+        try:
+            added = sync(index, database)
+        finally:
+            database.close()
+        print(f"Done, {added} resumes added ({len(index)} indexed)", file=sys.stderr)
+    elif args.command == 'query':
+        text = args.text
+        if text.startswith('@'):
+            with open(text[1:], encoding='utf-8') as f:
+                text = f.read()
+        start = time.perf_counter()
+        hits = index.search(text, args.k)
+        elapsed = time.perf_counter() - start
+        for rank, (fingerprint, score) in enumerate(hits, 1):
+            print(f"{rank:>3}  {score:.4f}  {fingerprint}")
+        print(f"{len(index)} resumes searched in {elapsed * 1000:.1f} ms", file=sys.stderr)
+    elif args.command == 'compact':
+        index.compact()
+        print(f"Compacted into {len(index.segments)} segment(s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Convert legacy user_data rows into the typed analysis_results schema.
+
+    python migrate.py [--batch-size 1000]
+
+Rows are read in ID order and written in batches; each migrated row keeps its
+old ID in analysis_results.legacy_id, so the command can be stopped and run
+again without duplicating anything.
+"""
+import argparse
+import ast
+import datetime
+import re
+import sys
+
+from db import Database
+
+LEGACY_TIMESTAMP_FORMAT = '%Y-%m-%d_%H:%M:%S'
+
+
+def parse_list(value):
+    """Parse a str(list) column, recovering what we can from truncated values"""
+    try:
+        parsed = ast.literal_eval(value)
+        if isinstance(parsed, (list, tuple)):
+            return [str(item) for item in parsed]
+    except (ValueError, SyntaxError):
+        pass
+    # VARCHAR(300) cut the list off mid-way, keep the complete quoted items
+    return re.findall(r"'([^']*)'", value or '')
+
+
+def parse_int(value):
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return 0
+
+
+def parse_timestamp(value):
+    try:
+        return datetime.datetime.strptime(value, LEGACY_TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def convert_row(row):
+    (legacy_id, name, email, resume_score, timestamp, page_no, field, level, skills, recommended_skills,
+     courses) = row
+    return {
+        'legacy_id': legacy_id,
+        'name': name,
+        'email': email,
+        'resume_score': parse_int(resume_score),
+        'no_of_pages': parse_int(page_no),
+        'created_at': parse_timestamp(timestamp),
+        'predicted_field': field,
+        'user_level': level,
+        'skills': parse_list(skills),
+        'recommended_skills': parse_list(recommended_skills),
+        'courses': parse_list(courses),
+    }
+
+
+def migrate(database, batch_size=1000):
+    # Resume after the last legacy row already converted
+    last_id = database.fetchall("SELECT MAX(legacy_id) FROM analysis_results")[0][0] or 0
+    migrated = 0
+    while True:
+        rows = database.fetchall("SELECT * FROM user_data WHERE ID > %s ORDER BY ID LIMIT %s",
+                                 (last_id, batch_size))
+        if not rows:
+            break
+        database.insert_results([convert_row(row) for row in rows])
+        migrated += len(rows)
+        last_id = rows[-1][0]
+        print(f"Migrated {migrated} rows (up to ID {last_id})", file=sys.stderr)
+    return migrated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate user_data into analysis_results")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    database = Database()
+    database.init_schema()
+    try:
+        total = migrate(database, args.batch_size)
+    finally:
+        database.close()
+    print(f"Done, {total} rows migrated", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
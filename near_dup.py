@@ -0,0 +1,329 @@
+"""Near-duplicate resumes: lightly edited re-submissions of the same resume.
+
+    python near_dup.py cluster [Uploaded_Resumes/ ...] [--from-db] [--workers 4]
+    python near_dup.py check resume.pdf
+
+Each resume's text is reduced to a MinHash signature over word shingles.
+Signatures are cut into LSH bands kept in SQLite (SRA_NEAR_DUP_DB), so a
+new upload is compared only with the resumes sharing a band bucket: a fixed
+number of indexed lookups whatever the corpus size. Candidates whose
+estimated Jaccard similarity reaches SRA_NEAR_DUP_THRESHOLD are linked to
+the earliest resume of their group.
+
+``cluster`` indexes an existing archive in bulk and groups it with
+union-find.
+"""
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+NEAR_DUP_DB_PATH = os.environ.get('SRA_NEAR_DUP_DB', 'near_dup.db')
+THRESHOLD = float(os.environ.get('SRA_NEAR_DUP_THRESHOLD', 0.8))
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+# 16 bands of 8 rows: a pair shares a bucket with probability 1-(1-s^8)^16,
+# about 0.61 at s=0.7, 0.95 at the default 0.8 threshold and 0.99 at 0.85,
+# so roughly one pair in twenty right at the threshold is missed
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# Shingles hashed per step, bounds memory on very long documents
+CHUNK = 2048
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Fixed seed: signatures must agree between processes and runs
+_rng = np.random.default_rng(20240601)
+_MULTIPLIERS = _rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_OFFSETS = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS minhash_signatures
+       (fingerprint TEXT PRIMARY KEY, signature BLOB NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS minhash_bands
+       (band INTEGER NOT NULL, bucket INTEGER NOT NULL, fingerprint TEXT NOT NULL,
+        PRIMARY KEY (band, bucket, fingerprint))""",
+    """CREATE TABLE IF NOT EXISTS near_duplicates
+       (fingerprint TEXT PRIMARY KEY, duplicate_of TEXT NOT NULL, similarity REAL NOT NULL)""",
+]
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """crc32 of every run of ``size`` words, as a unique uint64 array"""
+    words = TOKEN_RE.findall(text.lower())
+    if len(words) < size:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = (' '.join(words[i:i + size]) for i in range(len(words) - size + 1))
+    return np.unique(np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64))
+
+
+def signature(text):
+    """MinHash signature (NUM_PERM uint32), None for a document with no words"""
+    hashed = shingles(text)
+    if not len(hashed):
+        return None
+    result = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    for start in range(0, len(hashed), CHUNK):
+        # Multiply-shift hashing, one column per permutation
+        values = (hashed[start:start + CHUNK, None] * _MULTIPLIERS + _OFFSETS) >> np.uint64(32)
+        np.minimum(result, values.min(axis=0), out=result)
+    return result.astype(np.uint32)
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(first == second)) / NUM_PERM
+
+
+def band_buckets(sig):
+    """One signed 64-bit bucket id per band"""
+    return [int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), 'little', signed=True)
+            for band in sig.reshape(BANDS, ROWS)]
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # Path compression
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[second] = first
+
+    def groups(self):
+        groups = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return [members for members in groups.values() if len(members) > 1]
+
+
+class NearDuplicateIndex:
+    def __init__(self, path=NEAR_DUP_DB_PATH, threshold=THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+
+    def close(self):
+        self._connection.close()
+
+    def duplicate_of(self, fingerprint):
+        """(earlier fingerprint, similarity) recorded for a resume, or None"""
+        with self._lock:
+            row = self._connection.execute("SELECT duplicate_of, similarity FROM near_duplicates "
+                                           "WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        return tuple(row) if row else None
+
+    def _candidates(self, buckets, exclude):
+        placeholders = ', '.join('(?, ?)' for _ in buckets)
+        params = [value for band, bucket in enumerate(buckets) for value in (band, bucket)]
+        rows = self._connection.execute(
+            "SELECT DISTINCT s.fingerprint, s.signature FROM minhash_bands b "
+            "JOIN minhash_signatures s ON s.fingerprint = b.fingerprint "
+            f"WHERE (b.band, b.bucket) IN (VALUES {placeholders})", params).fetchall()
+        return [(fingerprint, np.frombuffer(blob, dtype=np.uint32))
+                for fingerprint, blob in rows if fingerprint != exclude]
+
+    def check(self, fingerprint, text):
+        """Index a resume and return (earlier fingerprint, similarity) when it
+        nearly duplicates one already indexed, otherwise None."""
+        sig = signature(text)
+        if sig is None:
+            return None
+        buckets = band_buckets(sig)
+        with self._lock, self._connection:
+            known = self._connection.execute("SELECT 1 FROM minhash_signatures WHERE fingerprint = ?",
+                                             (fingerprint,)).fetchone()
+            if known:
+                row = self._connection.execute("SELECT duplicate_of, similarity FROM near_duplicates "
+                                               "WHERE fingerprint = ?", (fingerprint,)).fetchone()
+                return tuple(row) if row else None
+
+            best = None
+            for candidate, candidate_sig in self._candidates(buckets, fingerprint):
+                score = similarity(sig, candidate_sig)
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (candidate, score)
+            self._store(fingerprint, sig, buckets)
+            if best is None:
+                return None
+            # Link to the first version, not to the previous revision
+            root = self._connection.execute("SELECT duplicate_of FROM near_duplicates WHERE fingerprint = ?",
+                                            (best[0],)).fetchone()
+            link = (root[0] if root else best[0], best[1])
+            self._connection.execute("INSERT OR REPLACE INTO near_duplicates (fingerprint, duplicate_of, similarity) "
+                                     "VALUES (?, ?, ?)", (fingerprint, *link))
+            return link
+
+    def _store(self, fingerprint, sig, buckets):
+        self._connection.execute("INSERT OR REPLACE INTO minhash_signatures (fingerprint, signature) VALUES (?, ?)",
+                                 (fingerprint, sig.tobytes()))
+        self._connection.executemany("INSERT OR IGNORE INTO minhash_bands (band, bucket, fingerprint) "
+                                     "VALUES (?, ?, ?)",
+                                     [(band, bucket, fingerprint) for band, bucket in enumerate(buckets)])
+
+    def add_many(self, signatures):
+        """Store [(fingerprint, signature), ...] without checking, in one transaction"""
+        with self._lock, self._connection:
+            for fingerprint, sig in signatures:
+                self._store(fingerprint, sig, band_buckets(sig))
+
+    def link_many(self, links):
+        """Record [(fingerprint, duplicate_of, similarity), ...]"""
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO near_duplicates (fingerprint, duplicate_of, "
+                                         "similarity) VALUES (?, ?, ?)", links)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index():
+    """Process-wide NearDuplicateIndex"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = NearDuplicateIndex()
+        return _index
+
+
+def cluster(signatures, threshold=THRESHOLD):
+    """Group [(fingerprint, signature), ...] into near-duplicate clusters.
+
+    Returns (clusters, links): each cluster lists fingerprints in input
+    order, links pair every later member with the first one and their
+    similarity.
+    """
+    buckets = {}
+    union_find = UnionFind()
+    order = {}
+    by_fingerprint = {}
+    for position, (fingerprint, sig) in enumerate(signatures):
+        order.setdefault(fingerprint, position)
+        by_fingerprint[fingerprint] = sig
+        for band, bucket in enumerate(band_buckets(sig)):
+            buckets.setdefault((band, bucket), []).append(fingerprint)
+
+    checked = set()
+    for members in buckets.values():
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                pair = (first, second)
+                if first == second or pair in checked:
+                    continue
+                checked.add(pair)
+                if similarity(by_fingerprint[first], by_fingerprint[second]) >= threshold:
+                    union_find.union(first, second)
+
+    clusters = [sorted(members, key=order.get) for members in union_find.groups()]
+    links = []
+    for members in clusters:
+        root = members[0]
+        links += [(member, root, similarity(by_fingerprint[member], by_fingerprint[root]))
+                  for member in members[1:]]
+    return sorted(clusters, key=lambda members: order[members[0]]), links
+
+
+def signature_for_path(path):
+    """Worker entry point: (fingerprint, signature, path) for one PDF, None if unreadable"""
+    from resume_parser import ingest_pdf
+    try:
+        doc = ingest_pdf(path)
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+        return None
+    sig = signature(doc['text'])
+    return (doc['hash'], sig, path) if sig is not None else None
+
+
+def _signatures_from_paths(paths, workers):
+    from batch import iter_pdf_paths, map_bounded
+
+    if workers <= 1:
+        yield from filter(None, map(signature_for_path, iter_pdf_paths(paths)))
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        yield from filter(None, map_bounded(executor, signature_for_path, iter_pdf_paths(paths), workers * 4))
+
+
+def _signatures_from_db():
+    from db import Database
+
+    database = Database()
+    database.init_schema()
+    try:
+        for doc in database.iter_documents():
+            sig = signature(doc['text'])
+            if sig is not None:
+                yield doc['hash'], sig, doc['hash']
+    finally:
+        database.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find near-duplicate resumes")
+    parser.add_argument('--index', default=NEAR_DUP_DB_PATH)
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    commands = parser.add_subparsers(dest='command', required=True)
+    batch = commands.add_parser('cluster', help="index and cluster an existing archive")
+    batch.add_argument('paths', nargs='*', default=[os.environ.get('SRA_UPLOAD_DIR', './Uploaded_Resumes')])
+    batch.add_argument('--from-db', action='store_true', help="read the text saved in the database instead")
+    batch.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    check = commands.add_parser('check', help="check one PDF against the index (and add it)")
+    check.add_argument('pdf')
+    args = parser.parse_args(argv)
+
+    index = NearDuplicateIndex(args.index, args.threshold)
+    try:
+        if args.command == 'cluster':
+            rows = _signatures_from_db() if args.from_db else _signatures_from_paths(args.paths, args.workers)
+            signatures = []
+            labels = {}
+            for fingerprint, sig, label in rows:
+                signatures.append((fingerprint, sig))
+                labels.setdefault(fingerprint, label)
+            clusters, links = cluster(signatures, args.threshold)
+            index.add_many(signatures)
+            index.link_many(links)
+            for members in clusters:
+                print(' | '.join(labels[member] for member in members))
+            print(f"{len(signatures)} resumes, {len(clusters)} near-duplicate groups, "
+                  f"{len(links)} resumes linked", file=sys.stderr)
+        else:
+            from resume_parser import ingest_pdf
+            doc = ingest_pdf(args.pdf)
+            match = index.check(doc['hash'], doc['text'])
+            if match:
+                print(f"Near duplicate of {match[0]} (similarity {match[1]:.2f})")
+            else:
+                print("No near duplicate found")
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
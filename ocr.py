@@ -0,0 +1,163 @@
+"""Optional OCR for scanned resumes.
+
+Pages without a text layer are rasterized with pypdfium2 and read by a local
+Tesseract install through pytesseract; nothing goes over the network. Both
+packages (and the tesseract binary) are optional, without them scanned pages
+simply stay empty.
+
+Pages are OCR'd in parallel on a process pool started for the document, and
+a document gets at most SRA_OCR_TIME_BUDGET seconds. The pool is killed
+then, so pages still running are left empty and don't keep Tesseract busy.
+Recognized text is cached by the hash of the page raster, in memory and on
+disk, so a repeat upload never runs Tesseract twice.
+"""
+import hashlib
+import multiprocessing
+import os
+import time
+from functools import lru_cache
+
+from cache import ContentCache
+
+OCR_ENABLED = os.environ.get('SRA_OCR', '1').lower() not in ('', '0', 'false', 'no')
+OCR_DPI = int(os.environ.get('SRA_OCR_DPI', 300))
+OCR_LANG = os.environ.get('SRA_OCR_LANG', 'eng')
+OCR_WORKERS = int(os.environ.get('SRA_OCR_WORKERS', os.cpu_count() or 1))
+OCR_TIME_BUDGET = float(os.environ.get('SRA_OCR_TIME_BUDGET', 60))
+OCR_CACHE_SIZE = int(os.environ.get('SRA_OCR_CACHE_SIZE', 512))
+# On-disk cache shared between processes (empty = memory only), holding at
+# most about OCR_CACHE_MAX_FILES pages (0 = unbounded). On by default for the
+# same reason as resume_parser.INGEST_CACHE_DIR.
+OCR_CACHE_DIR = os.environ.get('SRA_OCR_CACHE_DIR', './cache/ocr')
+OCR_CACHE_MAX_FILES = int(os.environ.get('SRA_OCR_CACHE_MAX_FILES', 50000))
+
+_pool_in_worker = False
+# Set by allow_pool(), the share of the machine one analysis may use
+_pool_workers = OCR_WORKERS
+_time_budget = OCR_TIME_BUDGET
+_ocr_cache = ContentCache(OCR_CACHE_SIZE, OCR_CACHE_DIR, '.txt', label='OCR cache', max_files=OCR_CACHE_MAX_FILES)
+
+
+@lru_cache(maxsize=None)
+def available():
+    """True when OCR is enabled and pypdfium2, pytesseract and tesseract exist"""
+    if not OCR_ENABLED:
+        return False
+    try:
+        import pypdfium2  # noqa: F401
+        import pytesseract
+        pytesseract.get_tesseract_version()
+    except Exception as e:
+        print(f"OCR unavailable, scanned pages will be empty: {e}")
+        return False
+    return True
+
+
+def allow_pool(workers=OCR_WORKERS, budget=OCR_TIME_BUDGET):
+    """Use a pool of at most ``workers`` in this worker process too, and give a
+    document at most ``budget`` seconds. limits.py runs one analysis per
+    process, so there pages are the only thing to run in parallel."""
+    global _pool_in_worker, _pool_workers, _time_budget
+    _pool_in_worker = True
+    _pool_workers = max(1, min(OCR_WORKERS, workers))
+    _time_budget = min(OCR_TIME_BUDGET, budget)
+
+
+def _inline():
+    # Already on a worker (batch.py, api.py) where documents run in
+    # parallel, so pages are read inline rather than on a nested pool
+    return multiprocessing.parent_process() is not None and not _pool_in_worker
+
+
+def _start_pool(pages):
+    # Spawned, not forked: the Streamlit server is multi-threaded and has
+    # pdfium loaded, neither survives fork() reliably
+    return multiprocessing.get_context('spawn').Pool(min(_pool_workers, pages))
+
+
+def raster_hash(raw, lang=OCR_LANG):
+    digest = hashlib.sha256(raw)
+    digest.update(lang.encode())
+    return digest.hexdigest()
+
+
+def _recognize(mode, size, raw, lang):
+    """Worker entry point, OCR one raw page bitmap"""
+    import pytesseract
+    from PIL import Image
+    return pytesseract.image_to_string(Image.frombytes(mode, size, raw), lang=lang)
+
+
+def ocr_pages(data, page_numbers, dpi=OCR_DPI, lang=OCR_LANG, budget=None):
+    """OCR the given (0-based) pages of a PDF and return {page_number: text}.
+
+    Pages are rendered one at a time and handed to the pool as soon as they
+    are ready. Pages that don't finish within ``budget`` seconds (by default
+    SRA_OCR_TIME_BUDGET, or what allow_pool() set) are missing
+    from the result and are not cached, so a later attempt can fill them in.
+    """
+    if not page_numbers or not available():
+        return {}
+    import pypdfium2
+
+    budget = _time_budget if budget is None else budget
+    deadline = time.monotonic() + budget
+    inline = _inline()
+    texts = {}
+    pending = {}
+    pool = None
+    try:
+        try:
+            pdf = pypdfium2.PdfDocument(data)
+            try:
+                for number in page_numbers:
+                    if time.monotonic() >= deadline:
+                        break
+                    page = pdf[number]
+                    try:
+                        image = page.render(scale=dpi / 72, grayscale=True).to_pil()
+                    finally:
+                        page.close()
+                    raw = image.tobytes()
+                    key = raster_hash(raw, lang)
+                    cached = _ocr_cache.get(key)
+                    if cached is not None:
+                        texts[number] = cached
+                        continue
+                    args = (image.mode, image.size, raw, lang)
+                    if inline:
+                        try:
+                            texts[number] = _recognize(*args)
+                        except Exception as e:
+                            print(f"Error running OCR: {e}")
+                            continue
+                        _ocr_cache.put(key, texts[number])
+                        continue
+                    if pool is None:
+                        pool = _start_pool(len(page_numbers))
+                    pending[number] = (key, pool.apply_async(_recognize, args))
+            finally:
+                pdf.close()
+        except Exception as e:
+            print(f"Error rasterizing PDF for OCR: {e}")
+
+        for number, (key, result) in pending.items():
+            result.wait(max(0.0, deadline - time.monotonic()))
+            if not result.ready():
+                continue
+            try:
+                text = result.get()
+            except Exception as e:
+                print(f"Error running OCR: {e}")
+                continue
+            _ocr_cache.put(key, text)
+            texts[number] = text
+    finally:
+        if pool is not None:
+            # Also kills pages still running past the budget, a running
+            # Tesseract job can't be cancelled any other way
+            pool.terminate()
+            pool.join()
+    if len(texts) < len(page_numbers) and time.monotonic() >= deadline:
+        print(f"OCR time budget of {budget:g}s exceeded, some pages were skipped")
+    return texts
@@ -0,0 +1,54 @@
+"""Re-derive stored analyses after the scoring rules or keyword tables change.
+
+    python reanalyze.py [--batch-size 200]
+
+Works from the extracted text saved in resume_documents, so no PDF is parsed
+again. Only results whose analyzer_version differs from
+analyzer.ANALYZER_VERSION are touched; their derived columns, skills and
+recommended courses are updated in place.
+"""
+import argparse
+import sys
+
+from analyzer import ANALYZER_VERSION, analyze_document, result_row
+from db import Database
+
+
+def reanalyze(database, batch_size=200):
+    current = {fingerprint for fingerprint, in database.fetchall(
+        "SELECT fingerprint FROM analysis_results WHERE analyzer_version = %s", (ANALYZER_VERSION,))}
+    batch = []
+    updated = 0
+    for doc in database.iter_documents():
+        if doc['hash'] in current:
+            continue
+        analysis = analyze_document(doc)
+        # Course lists change with the analyzer too, replace the stored ones
+        batch.append(result_row(analysis, [course['name'] for course in analysis['recommended_courses']]))
+        if len(batch) >= batch_size:
+            database.insert_results(batch)
+            updated += len(batch)
+            batch = []
+            print(f"Re-analyzed {updated} resumes", file=sys.stderr)
+    if batch:
+        database.insert_results(batch)
+        updated += len(batch)
+    return updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute stored analyses with the current analyzer")
+    parser.add_argument('--batch-size', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    database = Database()
+    database.init_schema()
+    try:
+        total = reanalyze(database, args.batch_size)
+    finally:
+        database.close()
+    print(f"Done, {total} resumes re-analyzed to version {ANALYZER_VERSION}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
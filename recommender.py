@@ -0,0 +1,83 @@
+"""Course recommendations ranked against the skills a candidate is missing.
+
+The course lists from courses.py are indexed once at import: duplicates are
+dropped, and every course is tagged with the fields it belongs to and the
+skills its title mentions. recommend_courses() then scores the predicted
+field's courses (plus courses from other fields that teach a missing skill)
+without touching the shared lists. Ties are broken by a seeded shuffle, so
+the same seed always gives the same courses.
+"""
+import heapq
+import random
+
+from fields import FIELDS, FIELDS_BY_NAME
+from skills import SkillMatcher, default_matcher
+
+# A course from the predicted field outranks an unrelated one covering the
+# same number of missing skills
+FIELD_BONUS = 1.0
+
+
+def _build_index(fields):
+    """Return (courses, {field name: [course id]}, {skill: [course id]})"""
+    vocabulary = list(default_matcher.vocabulary)
+    for field in fields:
+        vocabulary += field['recommended_skills']
+    matcher = SkillMatcher(vocabulary)
+
+    courses = []
+    by_link = {}
+    field_courses = {}
+    skill_courses = {}
+    for field in fields:
+        ids = field_courses.setdefault(field['name'], [])
+        for name, link in field['courses']:
+            course_id = by_link.get(link)
+            if course_id is None:
+                course_id = by_link[link] = len(courses)
+                skills = frozenset(matcher.find(name))
+                courses.append({'name': name, 'link': link, 'skills': skills})
+                for skill in skills:
+                    skill_courses.setdefault(skill, []).append(course_id)
+            if course_id not in ids:
+                ids.append(course_id)
+    return courses, field_courses, skill_courses
+
+
+COURSES, FIELD_COURSES, SKILL_COURSES = _build_index(FIELDS)
+
+
+def missing_skills(field_name, skills):
+    """Lowercase recommended skills of the field the candidate doesn't list"""
+    field = FIELDS_BY_NAME.get(field_name)
+    if not field:
+        return set()
+    have = {skill.lower() for skill in skills}
+    return {skill.lower() for skill in field['recommended_skills']} - have
+
+
+def recommend_courses(field_name, skills, n=4, seed=0):
+    """Top ``n`` courses as [(name, link), ...] for a candidate in ``field_name``.
+
+    Courses are scored by how many of the candidate's missing skills their
+    title covers, plus FIELD_BONUS for courses of the predicted field. Equal
+    scores are ordered by a shuffle seeded with ``seed`` (e.g. the resume
+    fingerprint), so reruns show the same list.
+    """
+    missing = missing_skills(field_name, skills)
+    candidates = set(FIELD_COURSES.get(field_name, ()))
+    for skill in missing:
+        candidates.update(SKILL_COURSES.get(skill, ()))
+    if not candidates:
+        return []
+
+    in_field = set(FIELD_COURSES.get(field_name, ()))
+    rng = random.Random(seed)
+    # One draw per course in index order, so the tie-break doesn't depend on set order
+    ranked = []
+    for course_id in sorted(candidates):
+        course = COURSES[course_id]
+        score = len(course['skills'] & missing) + (FIELD_BONUS if course_id in in_field else 0.0)
+        ranked.append((-score, rng.random(), course_id))
+    return [(COURSES[course_id]['name'], COURSES[course_id]['link'])
+            for _, _, course_id in heapq.nsmallest(n, ranked)]
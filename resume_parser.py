@@ -0,0 +1,174 @@
+import hashlib
+import io
+import itertools
+import json
+import os
+
+import ocr
+from cache import ContentCache
+from contact import extract_contact
+from instrumentation import timer
+from skills import match_skills
+
+# Parsed PDFs are cached by the SHA-256 of their bytes, so re-uploads and
+# Streamlit reruns never open the same document twice.
+INGEST_CACHE_SIZE = int(os.environ.get('SRA_INGEST_CACHE_SIZE', 128))
+# On-disk cache shared between processes (empty = memory only), holding at
+# most about INGEST_CACHE_MAX_FILES documents (0 = unbounded). On by default:
+# the app analyzes every upload in a fresh process (limits.py), where the
+# memory cache always starts empty.
+INGEST_CACHE_DIR = os.environ.get('SRA_INGEST_CACHE_DIR', './cache/ingest')
+INGEST_CACHE_MAX_FILES = int(os.environ.get('SRA_INGEST_CACHE_MAX_FILES', 10000))
+
+# Hard limits per document so an oversized upload can't tie up a worker
+MAX_PAGES = int(os.environ.get('SRA_MAX_PAGES', 50))
+MAX_TEXT_CHARS = int(os.environ.get('SRA_MAX_TEXT_CHARS', 500000))
+
+NAME_STOPWORDS = ['resume', 'cv', 'curriculum', 'email', 'phone', 'address']
+
+_ingest_cache = ContentCache(INGEST_CACHE_SIZE, INGEST_CACHE_DIR, '.json', load=json.load, dump=json.dump,
+                             label='PDF cache', max_files=INGEST_CACHE_MAX_FILES)
+
+
+def _read_bytes(file):
+    """Return the raw bytes of a path, bytes object or file-like upload"""
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        return bytes(file)
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            return f.read()
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def iter_pages(file, max_pages=MAX_PAGES, max_chars=MAX_TEXT_CHARS, info=None):
+    """Yield the text of each page lazily, one page's layout objects in memory at a time.
+
+    Stops after ``max_pages`` pages or ``max_chars`` characters of text.
+    Image-only pages yield "". If ``info`` is a dict it receives the
+    document's 'no_of_pages' and whether the output was 'truncated'.
+    """
+    # Imported on first parse, pdfminer is slow to load and the admin view never needs it
+    import pdfplumber
+
+    if info is None:
+        info = {}
+    info['truncated'] = False
+    with pdfplumber.open(io.BytesIO(_read_bytes(file))) as pdf:
+        info['no_of_pages'] = len(pdf.pages)
+        remaining = max_chars
+        for number, page in enumerate(pdf.pages):
+            if number >= max_pages or remaining <= 0:
+                info['truncated'] = True
+                return
+            text = page.extract_text() or ""
+            # Drop the page's parsed layout objects before moving on
+            page.close()
+            if len(text) > remaining:
+                text = text[:remaining]
+                info['truncated'] = True
+            remaining -= len(text)
+            yield text
+
+
+def iter_lines(pages):
+    """Lines of a sequence of page texts, in the same order as the joined document text"""
+    for page in pages:
+        yield from page.split('\n')
+
+
+def extract_name(lines):
+    """Pick the name from the first 5 lines, reading no further"""
+    # Basic approach - assuming name is in the first few lines
+    for line in itertools.islice(lines, 5):
+        if line and not any(keyword in line.lower() for keyword in NAME_STOPWORDS):
+            # Assume first significant line that's not a header might be the name
+            return line.strip()
+    return ""
+
+
+def ingest_pdf(file):
+    """Parse a PDF once and return its text, per-page text and page count.
+
+    ``file`` may be a path, raw bytes or an uploaded file object. Results are
+    cached by content hash (LRU in memory and on disk).
+    """
+    data = _read_bytes(file)
+    key = content_hash(data)
+    doc = _ingest_cache.get(key)
+    if doc is not None:
+        return doc
+
+    info = {}
+    try:
+        with timer('pdf_parse'):
+            # Every consumer needs the whole text (OCR of blank pages, skills,
+            # sections, the cache, the database), so the pages are collected;
+            # the text kept is bounded by MAX_TEXT_CHARS, not by one page
+            pages = list(iter_pages(data, info=info))
+    except Exception as e:
+        print(f"Error reading PDF file: {e}")
+        # Don't cache failures, the next attempt may be a fixed upload
+        return {'hash': key, 'text': "", 'pages': [], 'no_of_pages': 0, 'truncated': False}
+
+    # Scanned pages have no text layer, OCR just those
+    complete = True
+    blank = [number for number, page in enumerate(pages) if not page.strip()]
+    if blank and ocr.available():
+        with timer('ocr', pages=len(blank)):
+            recognized = ocr.ocr_pages(data, blank)
+        for number, text in recognized.items():
+            pages[number] = text
+        complete = len(recognized) == len(blank)
+
+    doc = {
+        'hash': key,
+        'text': "".join(page + "\n" for page in pages),
+        'pages': pages,
+        'no_of_pages': info['no_of_pages'],
+        'truncated': info['truncated'],
+    }
+    # A document whose OCR ran out of time is retried on the next upload
+    if complete:
+        _ingest_cache.put(key, doc)
+    return doc
+
+
+def pdf_reader(file):
+    return ingest_pdf(file)['text']
+
+
+def extract_resume_data(pdf_path):
+    """Extract basic information from resume PDF"""
+    # Extract text and page count from a single (cached) parse
+    return extract_from_document(ingest_pdf(pdf_path))
+
+
+def extract_from_document(doc):
+    """Extract basic information from an already ingested document"""
+    with timer('contact'):
+        contact = extract_contact(doc['text'])
+        # Extract name from the first lines only
+        name = extract_name(iter_lines(doc['pages']))
+
+    # Extract skills in one pass over the text (deduplicated, with hit counts)
+    with timer('skills'):
+        skill_hits = match_skills(doc['text'])
+    skills = list(skill_hits)
+
+    return {
+        'name': name,
+        'email': contact['email'],
+        'mobile_number': contact['phone'],
+        'linkedin': contact['linkedin'],
+        'github': contact['github'],
+        'skills': skills,
+        'skill_hits': skill_hits,
+        'no_of_pages': doc['no_of_pages']
+    }
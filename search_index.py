@@ -0,0 +1,218 @@
+"""Full-text search over analyzed resumes (SQLite FTS5, no outside service).
+
+    python search_index.py rebuild [Uploaded_Resumes/ ...] [--workers 4]
+    python search_index.py query 'kubernetes AND kotlin' [--page 1]
+
+Each resume is one row with its name, email, skills, detected section
+headings and full extracted text. Queries use FTS5 syntax: AND / OR / NOT,
+"quoted phrases", prefix* terms and column filters such as skills:kotlin.
+Results are ranked by bm25 with name and skills weighted above body text.
+
+The index is its own SQLite file (SRA_SEARCH_DB) whichever backend holds the
+results. The app adds each new analysis as it is saved; rebuild re-creates
+the index by streaming PDFs from disk.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SEARCH_DB_PATH = os.environ.get('SRA_SEARCH_DB', 'search_index.db')
+PAGE_SIZE = 20
+# bm25 weights in column order: name, email, skills, sections, text
+COLUMN_WEIGHTS = (5.0, 1.0, 3.0, 1.0, 1.0)
+
+SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS resume_search USING fts5
+       (name, email, skills, sections, text, fingerprint UNINDEXED, predicted_field UNINDEXED,
+        tokenize = 'porter unicode61')""",
+    # FTS5 can't look rows up by an unindexed column, this maps fingerprints to rowids
+    """CREATE TABLE IF NOT EXISTS resume_search_rows
+       (fingerprint TEXT PRIMARY KEY, search_rowid INTEGER NOT NULL)""",
+]
+
+
+class QueryError(ValueError):
+    """The search string isn't valid FTS5 query syntax"""
+
+
+def search_row(analysis, text):
+    """The indexed columns for one analysis and its extracted text"""
+    sections = sorted({span['key'] for span in analysis.get('section_spans', ())})
+    return {
+        'fingerprint': analysis['fingerprint'],
+        'name': analysis.get('name', ''),
+        'email': analysis.get('email', ''),
+        'skills': ', '.join(analysis.get('skills', ())),
+        'sections': ' '.join(sections),
+        'text': text,
+        'predicted_field': analysis.get('predicted_field', ''),
+    }
+
+
+class SearchIndex:
+    def __init__(self, path=SEARCH_DB_PATH):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+
+    def close(self):
+        self._connection.close()
+
+    def add(self, analysis, text):
+        """Index (or re-index) one analysis"""
+        self.add_many([search_row(analysis, text)])
+
+    def add_many(self, rows):
+        """Upsert many search_row() dicts in one transaction"""
+        with self._lock, self._connection:
+            cursor = self._connection.cursor()
+            for row in rows:
+                cursor.execute("SELECT search_rowid FROM resume_search_rows WHERE fingerprint = ?",
+                               (row['fingerprint'],))
+                existing = cursor.fetchone()
+                if existing:
+                    cursor.execute("DELETE FROM resume_search WHERE rowid = ?", existing)
+                cursor.execute("INSERT INTO resume_search (name, email, skills, sections, text, fingerprint, "
+                               "predicted_field) VALUES (:name, :email, :skills, :sections, :text, :fingerprint, "
+                               ":predicted_field)", row)
+                cursor.execute("INSERT OR REPLACE INTO resume_search_rows (fingerprint, search_rowid) "
+                               "VALUES (?, ?)", (row['fingerprint'], cursor.lastrowid))
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM resume_search")
+            self._connection.execute("DELETE FROM resume_search_rows")
+
+    def optimize(self):
+        """Merge the FTS5 b-trees, worth running after a bulk load"""
+        with self._lock, self._connection:
+            self._connection.execute("INSERT INTO resume_search (resume_search) VALUES ('optimize')")
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM resume_search_rows").fetchone()[0]
+
+    def search(self, query, page=1, page_size=PAGE_SIZE):
+        """Return (total matches, [result dict, ...]) for one page, best first.
+
+        Result dicts have fingerprint, name, email, predicted_field, score
+        (bm25, lower is better) and a highlighted snippet of the text.
+        """
+        weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+        try:
+            with self._lock:
+                total = self._connection.execute(
+                    "SELECT COUNT(*) FROM resume_search WHERE resume_search MATCH ?", (query,)).fetchone()[0]
+                rows = self._connection.execute(
+                    f"SELECT fingerprint, name, email, predicted_field, bm25(resume_search, {weights}) AS score, "
+                    "snippet(resume_search, 4, '**', '**', ' … ', 12) "
+                    "FROM resume_search WHERE resume_search MATCH ? ORDER BY score LIMIT ? OFFSET ?",
+                    (query, page_size, (page - 1) * page_size)).fetchall()
+        except sqlite3.OperationalError as e:
+            raise QueryError(str(e)) from e
+        keys = ('fingerprint', 'name', 'email', 'predicted_field', 'score', 'snippet')
+        results = [dict(zip(keys, row)) for row in rows]
+        for result in results:
+            result['snippet'] = ' '.join(result['snippet'].split())
+        return total, results
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index():
+    """Process-wide SearchIndex"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex()
+        return _index
+
+
+def index_path(path):
+    """Worker entry point: the search row for one PDF, or None if unreadable"""
+    from analyzer import analyze_document
+    from resume_parser import ingest_pdf
+    try:
+        doc = ingest_pdf(path)
+        if not doc['no_of_pages']:
+            return None
+        return search_row(analyze_document(doc), doc['text'])
+    except Exception as e:
+        print(f"Error indexing {path}: {e}")
+        return None
+
+
+def rebuild(index, paths, workers=1, batch_size=200):
+    """Re-create the index from the PDFs under ``paths``, streaming in batches"""
+    from batch import iter_pdf_paths, map_bounded
+
+    index.clear()
+    total = 0
+    batch = []
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        pdfs = iter_pdf_paths(paths)
+        rows = map_bounded(executor, index_path, pdfs, workers * 4) if executor else map(index_path, pdfs)
+        for row in rows:
+            if row is None:
+                continue
+            batch.append(row)
+            if len(batch) >= batch_size:
+                index.add_many(batch)
+                total += len(batch)
+                batch = []
+                print(f"Indexed {total} resumes", file=sys.stderr)
+        if batch:
+            index.add_many(batch)
+            total += len(batch)
+    finally:
+        if executor:
+            executor.shutdown()
+    index.optimize()
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Full-text search over analyzed resumes")
+    parser.add_argument('--index', default=SEARCH_DB_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('rebuild', help="re-create the index from resume PDFs")
+    build.add_argument('paths', nargs='*', default=[os.environ.get('SRA_UPLOAD_DIR', './Uploaded_Resumes')])
+    build.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    query = commands.add_parser('query', help="search the index")
+    query.add_argument('text')
+    query.add_argument('--page', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    index = SearchIndex(args.index)
+    try:
+        if args.command == 'rebuild':
+            start = time.perf_counter()
+            total = rebuild(index, args.paths, args.workers)
+            print(f"Done, {total} resumes indexed in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        else:
+            try:
+                total, results = index.search(args.text, args.page)
+            except QueryError as e:
+                sys.exit(f"Invalid query: {e}")
+            for result in results:
+                print(f"{result['score']:8.3f}  {result['name'] or '?'} <{result['email']}>  "
+                      f"{result['fingerprint'][:12]}")
+                print(f"          {result['snippet']}")
+            print(f"{total} matches", file=sys.stderr)
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
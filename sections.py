@@ -0,0 +1,128 @@
+import re
+
+# Resume sections we look for, the headings that name them, the points each
+# one is worth and the tips shown when it is present / missing. Sections with
+# weight 0 aren't scored, they are only located so their text can be reused.
+SECTIONS = [
+    {
+        'key': 'objective',
+        'terms': ['Objective', 'Objectives', 'Career Goal'],
+        'weight': 20,
+        'found_tip': "[+] Awesome! You have added Objective",
+        'missing_tip': "[-] According to our recommendation please add your career objective, it will give your "
+                       "career intension to the Recruiters.",
+    },
+    {
+        'key': 'declaration',
+        'terms': ['Declaration'],
+        'weight': 20,
+        'found_tip': "[+] Awesome! You have added Delcaration✍",
+        'missing_tip': "[-] According to our recommendation please add Declaration✍. It will give the assurance "
+                       "that everything written on your resume is true and fully acknowledged by you",
+    },
+    {
+        'key': 'hobbies',
+        'terms': ['Hobbies', 'Hobby', 'Interests', 'Hobbies & Interests', 'Hobbies and Interests'],
+        'weight': 20,
+        'found_tip': "[+] Awesome! You have added your Hobbies⚽",
+        'missing_tip': "[-] According to our recommendation please add Hobbies⚽. It will show your persnality to "
+                       "the Recruiters and give the assurance that you are fit for this role or not.",
+    },
+    {
+        'key': 'achievements',
+        'terms': ['Achievements', 'Accomplishments', 'Awards', 'Awards & Achievements'],
+        'weight': 20,
+        'found_tip': "[+] Awesome! You have added your Achievements🏅 ",
+        'missing_tip': "[-] According to our recommendation please add Achievements🏅. It will show that you are "
+                       "capable for the required position.",
+    },
+    {
+        'key': 'projects',
+        'terms': ['Projects', 'Project Work'],
+        'weight': 20,
+        'found_tip': "[+] Awesome! You have added your Projects👨‍💻 ",
+        'missing_tip': "[-] According to our recommendation please add Projects👨‍💻. It will show that you have "
+                       "done work related the required position or not.",
+    },
+    {'key': 'skills', 'terms': ['Skills', 'Skill Set', 'Skills Summary'], 'weight': 0},
+    {'key': 'education', 'terms': ['Education', 'Academics', 'Qualifications'], 'weight': 0},
+    {'key': 'experience', 'terms': ['Experience', 'Work History', 'Employment History', 'Employment'],
+     'weight': 0},
+]
+
+# Words allowed in front of a heading, e.g. "Career Objective", "Key Projects"
+HEADING_MODIFIERS = ['career', 'professional', 'key', 'academic', 'personal', 'technical', 'soft', 'work',
+                     'major', 'notable', 'other', 'relevant']
+
+
+def _normalize(heading):
+    return ' '.join(heading.lower().split())
+
+
+class SectionDetector:
+    """Find every section heading in a resume with one compiled regex.
+
+    A heading is a line holding one of the section terms, optionally preceded
+    by a modifier ("Career Objective") or a bullet, and optionally followed by
+    a colon and text on the same line ("Objective: To work ...").
+    """
+
+    def __init__(self, sections=SECTIONS, modifiers=HEADING_MODIFIERS):
+        self.sections = sections
+        self._term_to_section = {}
+        for section in sections:
+            for term in section['terms']:
+                self._term_to_section[_normalize(term)] = section
+        # Longest terms first so 'Hobbies & Interests' wins over 'Hobbies'
+        terms = sorted(self._term_to_section, key=len, reverse=True)
+        term_pattern = '|'.join(r'[^\S\n]+'.join(re.escape(word) for word in term.split()) for term in terms)
+        modifier_pattern = '|'.join(re.escape(modifier) for modifier in modifiers)
+        self._regex = re.compile(
+            r'^[^\S\n]*(?:[•*\-–][^\S\n]*)?(?:(?:%s)[^\S\n]+)?(?P<term>%s)[^\S\n]*(?::.*)?$'
+            % (modifier_pattern, term_pattern),
+            re.IGNORECASE | re.MULTILINE)
+
+    def detect(self, text):
+        """Return the headings found, in order, as dicts with the section key,
+        the heading line and the (start, end) span of the section's text up to
+        the next heading."""
+        found = []
+        for match in self._regex.finditer(text):
+            section = self._term_to_section[_normalize(match.group('term'))]
+            found.append({'key': section['key'], 'heading': match.group().strip(), 'start': match.start(),
+                          'end': len(text)})
+        for current, following in zip(found, found[1:]):
+            current['end'] = following['start']
+        return found
+
+    def score(self, text, found=None):
+        """Return (resume score, [(section row, found), ...]) for the scored sections"""
+        if found is None:
+            found = self.detect(text)
+        present = {section['key'] for section in found}
+        score = 0
+        results = []
+        for section in self.sections:
+            if not section['weight']:
+                continue
+            is_present = section['key'] in present
+            if is_present:
+                score += section['weight']
+            results.append((section, is_present))
+        return score, results
+
+
+default_detector = SectionDetector()
+
+
+def detect_sections(text):
+    return default_detector.detect(text)
+
+
+def score_sections(text, found=None):
+    return default_detector.score(text, found)
+
+
+def section_text(text, found, key):
+    """Concatenated text of every section with the given key"""
+    return '\n'.join(text[section['start']:section['end']] for section in found if section['key'] == key)
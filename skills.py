@@ -0,0 +1,109 @@
+import re
+
+from fields import FIELDS, GENERIC_KEYWORDS
+
+# Base skill vocabulary, default_matcher adds the field keywords to it.
+# Extend it with SkillMatcher.add() or load_vocabulary()
+SKILL_KEYWORDS = [
+    'python', 'java', 'javascript', 'html', 'css', 'react', 'angular', 'node',
+    'sql', 'mongodb', 'django', 'flask', 'machine learning', 'ai', 'data science',
+    'excel', 'powerpoint', 'word', 'adobe', 'photoshop', 'c++', 'c#', 'php',
+    'kubernetes', 'docker', 'aws', 'azure', 'gcp', 'linux', 'bash', 'git',
+    'agile', 'scrum', 'project management', 'leadership'
+]
+
+# Characters that may not touch either side of a skill (so 'ai' doesn't hit
+# 'maintain' and 'c' doesn't hit 'c++')
+_WORD_CHARS = r'A-Za-z0-9_+#'
+
+
+def _normalize(skill):
+    return ' '.join(skill.lower().split())
+
+
+def _trie_pattern(node):
+    """Turn a character trie into a regex, so matching cost depends on the
+    length of the skills rather than on how many skills there are."""
+    terminal = '' in node
+    branches = []
+    for char in sorted(k for k in node if k != ''):
+        prefix = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(prefix + _trie_pattern(node[char]))
+    if not branches:
+        return ''
+    body = '|'.join(branches)
+    if len(branches) == 1 and not terminal:
+        return body
+    # Optional longer continuation is tried first, so the longest skill wins
+    return '(?:' + body + ')' + ('?' if terminal else '')
+
+
+class SkillMatcher:
+    """Find every vocabulary skill in a text in a single regex pass."""
+
+    def __init__(self, vocabulary=SKILL_KEYWORDS):
+        self.vocabulary = []
+        self._known = set()
+        self._regex = None
+        self.add(*vocabulary)
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def add(self, *skills):
+        for skill in skills:
+            key = _normalize(skill)
+            if key and key not in self._known:
+                self._known.add(key)
+                self.vocabulary.append(key)
+        self._compile()
+
+    def _compile(self):
+        trie = {}
+        for skill in self.vocabulary:
+            node = trie
+            for char in skill:
+                node = node.setdefault(char, {})
+            node[''] = True
+        self._regex = re.compile(
+            r'(?<![%s])%s(?![%s])' % (_WORD_CHARS, _trie_pattern(trie), _WORD_CHARS),
+            re.IGNORECASE)
+
+    def find(self, text):
+        """Return {skill: {'count': n, 'offsets': [...]}} ordered by first hit"""
+        hits = {}
+        if not self.vocabulary:
+            return hits
+        for match in self._regex.finditer(text):
+            skill = _normalize(match.group())
+            hit = hits.get(skill)
+            if hit is None:
+                hit = hits[skill] = {'count': 0, 'offsets': []}
+            hit['count'] += 1
+            hit['offsets'].append(match.start())
+        return hits
+
+    def skills(self, text):
+        return list(self.find(text))
+
+
+def load_vocabulary(path):
+    """Read one skill per line, ignoring blanks and '#' comments"""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def default_vocabulary():
+    """SKILL_KEYWORDS plus the keywords the field table scores on, so the
+    extractor finds them (except GENERIC_KEYWORDS, ordinary English words)"""
+    vocabulary = list(SKILL_KEYWORDS)
+    for field in FIELDS:
+        vocabulary += [keyword for keyword in field['keywords'] if keyword not in GENERIC_KEYWORDS]
+    return vocabulary
+
+
+default_matcher = SkillMatcher(default_vocabulary())
+
+
+def match_skills(text):
+    return default_matcher.find(text)
@@ -0,0 +1,157 @@
+"""Content-addressed storage for uploaded resumes.
+
+Uploads are saved as ``<sha256>.pdf`` so the same file uploaded twice is
+stored once, and original file names never collide. Writes happen on a
+background thread, and a retention policy keeps the directory bounded by
+age, file count and total size. First-page thumbnails replace the inline
+base64 PDF preview.
+"""
+import io
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from resume_parser import content_hash
+
+UPLOAD_DIR = os.environ.get('SRA_UPLOAD_DIR', './Uploaded_Resumes')
+MAX_STORED_FILES = int(os.environ.get('SRA_MAX_STORED_FILES', 5000))
+MAX_STORED_BYTES = int(os.environ.get('SRA_MAX_STORED_BYTES', 2 * 1024 ** 3))
+MAX_STORED_AGE_DAYS = float(os.environ.get('SRA_MAX_STORED_AGE_DAYS', 90))
+# Scanning the directory is O(files), so retention runs at most this often
+RETENTION_INTERVAL = float(os.environ.get('SRA_RETENTION_INTERVAL', 600))
+
+THUMBNAIL_CACHE_SIZE = 64
+THUMBNAIL_RESOLUTION = 60
+# Longest thumbnail side in pixels: a page with a huge mediabox is rendered
+# at a lower resolution instead of into a huge bitmap
+THUMBNAIL_MAX_SIDE = 1000
+
+# Only files we named are ever evicted, hand-placed samples are left alone
+STORED_NAME = re.compile(r'^[0-9a-f]{64}\.pdf$')
+
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sra-storage')
+_last_retention = 0.0
+_retention_lock = threading.Lock()
+_thumbnails = OrderedDict()
+_thumbnails_lock = threading.Lock()
+
+
+def stored_path(digest, upload_dir=UPLOAD_DIR):
+    return os.path.join(upload_dir, digest + '.pdf')
+
+
+def _write(data, digest, upload_dir):
+    path = stored_path(digest, upload_dir)
+    if os.path.exists(path):
+        # Duplicate upload, just mark it as recently used
+        os.utime(path)
+    else:
+        os.makedirs(upload_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    maybe_enforce_retention(upload_dir)
+    return path
+
+
+def save_upload(data, upload_dir=UPLOAD_DIR, wait=False):
+    """Store upload bytes under their content hash and return the hash.
+
+    The write runs on a background thread unless ``wait`` is true.
+    """
+    digest = content_hash(data)
+    future = _writer.submit(_write, data, digest, upload_dir)
+    if wait:
+        future.result()
+    return digest
+
+
+def maybe_enforce_retention(upload_dir=UPLOAD_DIR):
+    global _last_retention
+    with _retention_lock:
+        if time.monotonic() - _last_retention < RETENTION_INTERVAL:
+            return 0
+        _last_retention = time.monotonic()
+    return enforce_retention(upload_dir)
+
+
+def enforce_retention(upload_dir=UPLOAD_DIR, max_files=MAX_STORED_FILES, max_bytes=MAX_STORED_BYTES,
+                      max_age_days=MAX_STORED_AGE_DAYS):
+    """Evict stored uploads older than max_age_days, then least recently used
+    ones until the count and size limits hold. Returns the number removed."""
+    try:
+        names = os.listdir(upload_dir)
+    except FileNotFoundError:
+        return 0
+    entries = []
+    for name in names:
+        if not STORED_NAME.match(name):
+            continue
+        path = os.path.join(upload_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+
+    cutoff = time.time() - max_age_days * 86400
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for index, (mtime, size, path) in enumerate(entries):
+        remaining = len(entries) - index
+        if mtime >= cutoff and remaining <= max_files and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+    return removed
+
+
+def _run_inline(func, *args):
+    return func(*args)
+
+
+def render_png(data, resolution=THUMBNAIL_RESOLUTION, max_side=THUMBNAIL_MAX_SIDE):
+    """PNG bytes of the first page, no larger than max_side pixels"""
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(data), pages=[1]) as pdf:
+        page = pdf.pages[0]
+        longest = max(page.width, page.height)
+        if longest * resolution / 72 > max_side:
+            resolution = max_side * 72 / longest
+        image = page.to_image(resolution=resolution).original
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def render_thumbnail(data, digest=None, resolution=THUMBNAIL_RESOLUTION, run=_run_inline):
+    """PNG bytes of the first page, cached by content hash (None on failure).
+
+    The rendering goes through ``run(func, *args)``, e.g. limits.run_limited.
+    """
+    digest = digest or content_hash(data)
+    with _thumbnails_lock:
+        if digest in _thumbnails:
+            _thumbnails.move_to_end(digest)
+            return _thumbnails[digest]
+
+    try:
+        thumbnail = run(render_png, data, resolution)
+    except Exception as e:
+        print(f"Error rendering PDF preview: {e}")
+        return None
+
+    with _thumbnails_lock:
+        _thumbnails[digest] = thumbnail
+        while len(_thumbnails) > THUMBNAIL_CACHE_SIZE:
+            _thumbnails.popitem(last=False)
+    return thumbnail